@@ -0,0 +1,410 @@
+import random
+import numpy as np
+from typing import List
+
+# Примитивные многочлены для построения поля GF(2^m) (старший бит - x^m)
+PRIMITIVE_POLYNOMIALS = {
+    2: 0b111,
+    3: 0b1011,
+    4: 0b10011,
+    5: 0b100101,
+    6: 0b1000011,
+    7: 0b10001001,
+    8: 0b100011101,
+    9: 0b1000010001,
+    10: 0b10000001001,
+    11: 0b100000000101,
+    12: 0b1000001010011,
+    13: 0b10000000011011,
+    14: 0b100010001000011,
+    15: 0b1000000000000011,
+    16: 0b10001000000001011,
+}
+
+
+class GF2m:
+    """
+    Конечное поле GF(2^m): элементы - целые числа < 2^m,
+    умножение через таблицы степеней и логарифмов примитивного элемента
+    """
+    def __init__(self, m: int):
+        if m not in PRIMITIVE_POLYNOMIALS:
+            raise ValueError(f"Не поддерживается поле GF(2^{m})")
+        self.m = m
+        self.size = 1 << m
+        self.order = self.size - 1
+        poly = PRIMITIVE_POLYNOMIALS[m]
+
+        exp = [0] * (2 * self.order)
+        log = [0] * self.size
+        x = 1
+        for i in range(self.order):
+            exp[i] = x
+            log[x] = i
+            x <<= 1
+            if x & self.size:
+                x ^= poly
+        for i in range(self.order, 2 * self.order):
+            exp[i] = exp[i - self.order]
+
+        self.exp = exp
+        self.log = log
+        self.exp_np = np.array(exp, dtype=np.int64)
+        self.log_np = np.array(log, dtype=np.int64)
+
+    def mul(self, a: int, b: int):
+        if a == 0 or b == 0:
+            return 0
+        return self.exp[self.log[a] + self.log[b]]
+
+    def inv(self, a: int):
+        if a == 0:
+            raise ZeroDivisionError("Обратного элемента не существует")
+        return self.exp[self.order - self.log[a]]
+
+    def sqrt(self, a: int):
+        # В поле характеристики 2 возведение в квадрат - биекция,
+        # поэтому корень считается делением логарифма пополам
+        if a == 0:
+            return 0
+        l = self.log[a]
+        if l % 2:
+            l += self.order
+        return self.exp[l // 2]
+
+    def mul_vec(self, a: np.ndarray, b: np.ndarray):
+        """
+        Поэлементное умножение массивов элементов поля
+        """
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        res = self.exp_np[self.log_np[a] + self.log_np[b]]
+        return np.where((a == 0) | (b == 0), 0, res)
+
+    def inv_vec(self, a: np.ndarray):
+        a = np.asarray(a, dtype=np.int64)
+        if np.any(a == 0):
+            raise ZeroDivisionError("Обратного элемента не существует")
+        return self.exp_np[self.order - self.log_np[a]]
+
+
+# ------ Многочлены над GF(2^m): список коэффициентов от младшего к старшему
+
+def poly_trim(a: List[int]):
+    a = list(a)
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def poly_deg(a: List[int]):
+    return len(a) - 1
+
+
+def poly_add(a: List[int], b: List[int]):
+    if len(a) < len(b):
+        a, b = b, a
+    res = list(a)
+    for i, c in enumerate(b):
+        res[i] ^= c
+    return poly_trim(res)
+
+
+def poly_scale(field: GF2m, a: List[int], c: int):
+    if c == 0:
+        return []
+    return poly_trim([field.mul(x, c) for x in a])
+
+
+def poly_mul(field: GF2m, a: List[int], b: List[int]):
+    if not a or not b:
+        return []
+    exp, log = field.exp, field.log
+    res = [0] * (len(a) + len(b) - 1)
+    b_logs = [(j, log[y]) for j, y in enumerate(b) if y]
+    for i, x in enumerate(a):
+        if x:
+            lx = log[x]
+            for j, ly in b_logs:
+                res[i + j] ^= exp[lx + ly]
+    return poly_trim(res)
+
+
+def poly_divmod(field: GF2m, a: List[int], b: List[int]):
+    b = poly_trim(b)
+    if not b:
+        raise ZeroDivisionError("Деление на нулевой многочлен")
+    a = poly_trim(a)
+    db = len(b) - 1
+    if len(a) - 1 < db:
+        return [], a
+
+    exp, log, order = field.exp, field.log, field.order
+    rem = list(a)
+    quot = [0] * (len(a) - db)
+    lead_log = log[b[-1]]
+    b_logs = [(j, log[y]) for j, y in enumerate(b) if y]
+    for i in range(len(rem) - 1, db - 1, -1):
+        c = rem[i]
+        if c:
+            lf = (log[c] - lead_log) % order
+            quot[i - db] = exp[lf]
+            shift = i - db
+            for j, ly in b_logs:
+                rem[shift + j] ^= exp[lf + ly]
+    return poly_trim(quot), poly_trim(rem[:db])
+
+
+def poly_mod(field: GF2m, a: List[int], b: List[int]):
+    return poly_divmod(field, a, b)[1]
+
+
+def poly_mulmod(field: GF2m, a: List[int], b: List[int], g: List[int]):
+    return poly_mod(field, poly_mul(field, a, b), g)
+
+
+def poly_sqr(field: GF2m, a: List[int]):
+    # (sum a_i x^i)^2 = sum a_i^2 x^(2i) в характеристике 2
+    res = [0] * (2 * len(a) - 1) if a else []
+    for i, c in enumerate(a):
+        res[2 * i] = field.mul(c, c)
+    return res
+
+
+def poly_gcd(field: GF2m, a: List[int], b: List[int]):
+    a, b = poly_trim(a), poly_trim(b)
+    while b:
+        a, b = b, poly_mod(field, a, b)
+    return a
+
+
+def poly_inv_mod(field: GF2m, a: List[int], g: List[int]):
+    """
+    Обратный многочлен a^(-1) mod g (расширенный алгоритм Евклида)
+    """
+    r0, r1 = list(g), poly_mod(field, a, g)
+    s0, s1 = [], [1]
+    while len(r1) > 1:
+        q, r = poly_divmod(field, r0, r1)
+        r0, r1 = r1, r
+        s0, s1 = s1, poly_add(s0, poly_mul(field, q, s1))
+    if not r1:
+        raise ValueError("Многочлен необратим по модулю g")
+    return poly_scale(field, s1, field.inv(r1[0]))
+
+
+def poly_eval_vec(field: GF2m, a: List[int], xs: np.ndarray):
+    """
+    Значения многочлена сразу во многих точках (схема Горнера)
+    """
+    xs = np.asarray(xs, dtype=np.int64)
+    res = np.zeros(xs.shape, dtype=np.int64)
+    for c in reversed(a):
+        res = field.mul_vec(res, xs) ^ c
+    return res
+
+
+def is_irreducible(field: GF2m, g: List[int]):
+    """
+    Тест Бен-Ора: g неприводим, если gcd(g, x^(q^i) - x) = 1 для i <= deg(g)/2
+    """
+    t = poly_deg(g)
+    h = [0, 1]
+    for _ in range(t // 2):
+        for _ in range(field.m):
+            h = poly_mod(field, poly_sqr(field, h), g)
+        if len(poly_gcd(field, g, poly_add(h, [0, 1]))) > 1:
+            return False
+    return True
+
+
+def generate_goppa_polynomial(field: GF2m, t: int):
+    """
+    Случайный неприводимый унитарный многочлен степени t над GF(2^m)
+    """
+    while True:
+        g = [random.randrange(field.size) for _ in range(t)] + [1]
+        if g[0] == 0:
+            continue
+        if is_irreducible(field, g):
+            return g
+
+
+def gf2_systematic(H: np.ndarray):
+    """
+    Приведение двоичной матрицы к виду [B | I] гауссовым исключением.
+    Опорные столбцы выбираются справа налево, поэтому для матрицы,
+    уже имеющей вид [B | I], перестановка будет тождественной.
+    Возвращает матрицу [B | I] и перестановку столбцов
+    """
+    H = (np.array(H) % 2).astype(np.uint8)
+    rows, cols = H.shape
+    pivots = []
+    row = 0
+    for col in range(cols - 1, -1, -1):
+        if row == rows:
+            break
+        candidates = np.flatnonzero(H[row:, col]) + row
+        if candidates.size == 0:
+            continue
+        pivot_row = candidates[0]
+        if pivot_row != row:
+            H[[row, pivot_row]] = H[[pivot_row, row]]
+        mask = H[:, col].astype(bool)
+        mask[row] = False
+        H[mask] ^= H[row]
+        pivots.append(col)
+        row += 1
+
+    rank = len(pivots)
+    H = H[:rank]
+    # Строки упорядочиваем по возрастанию номера опорного столбца
+    order = np.argsort(pivots)
+    H = H[order]
+    pivot_cols = sorted(pivots)
+    pivot_set = set(pivot_cols)
+    free_cols = [c for c in range(cols) if c not in pivot_set]
+    perm = np.array(free_cols + pivot_cols, dtype=np.int64)
+    return H[:, perm], perm
+
+
+class GoppaCode:
+    """
+    Двоичный код Гоппы Г(L, g) с декодированием по алгоритму Паттерсона.
+    Носитель L упорядочен так, что порождающая матрица систематическая: G = [I | A].
+    Если передана готовая систематическая H (например, из файла ключа), носитель
+    считается уже упорядоченным и приведение к систематическому виду пропускается
+    """
+    def __init__(self, m: int, g: List[int], support, H: np.ndarray = None):
+        self.field = GF2m(m)
+        self.m = m
+        self.g = poly_trim(g)
+        self.t = poly_deg(self.g)
+
+        support = np.asarray(support, dtype=np.int64)
+        if np.any(poly_eval_vec(self.field, self.g, support) == 0):
+            raise ValueError("Многочлен Гоппы имеет корни на носителе")
+
+        # Строка j таблицы - коэффициенты многочлена 1/(x - L_j) mod g
+        table = self.inverse_linear_table(support)
+        if H is None:
+            self.H, perm = gf2_systematic(self.expand_to_binary(table))
+        else:
+            self.H, perm = np.asarray(H, dtype=np.uint8), np.arange(len(support))
+
+        self.support = support[perm]
+        self.syndrome_table = table[perm]
+        self.n = len(self.support)
+        self.k = self.n - self.H.shape[0]
+
+        B = self.H[:, :self.k]
+        self.G = np.hstack([np.eye(self.k, dtype=int), B.T.astype(int)])
+        self.H = self.H.astype(int)
+
+        # sqrt(x) mod g: g = g0^2 + x*g1^2  =>  sqrt(x) = g0 * g1^(-1)
+        g0 = poly_trim([self.field.sqrt(c) for c in self.g[0::2]])
+        g1 = poly_trim([self.field.sqrt(c) for c in self.g[1::2]])
+        self.sqrt_x = poly_mulmod(self.field, g0, poly_inv_mod(self.field, g1, self.g), self.g)
+
+    def inverse_linear_table(self, support: np.ndarray):
+        """
+        1/(x - a) = (g(x) - g(a)) / ((x - a) * g(a)) mod g,
+        частное считается делением Горнера сразу для всех a из носителя
+        """
+        f = self.field
+        t = self.t
+        table = np.zeros((len(support), t), dtype=np.int64)
+        q = np.full(len(support), self.g[t], dtype=np.int64)
+        table[:, t - 1] = q
+        for i in range(t - 1, 0, -1):
+            q = f.mul_vec(q, support) ^ self.g[i]
+            table[:, i - 1] = q
+        g_inv = f.inv_vec(poly_eval_vec(f, self.g, support))
+        for i in range(t):
+            table[:, i] = f.mul_vec(table[:, i], g_inv)
+        return table
+
+    def expand_to_binary(self, table: np.ndarray):
+        """
+        Двоичная проверочная матрица: каждый элемент GF(2^m) раскладывается на m бит
+        """
+        bits = (table[:, :, None] >> np.arange(self.m)) & 1
+        return bits.reshape(table.shape[0], -1).T.astype(np.uint8)
+
+    def syndrome(self, received: np.ndarray):
+        positions = np.flatnonzero(np.asarray(received) % 2)
+        if positions.size == 0:
+            return []
+        s = np.bitwise_xor.reduce(self.syndrome_table[positions], axis=0)
+        return poly_trim(s.tolist())
+
+    def poly_sqrt(self, a: List[int]):
+        # a = a0^2 + x*a1^2  =>  sqrt(a) = a0 + sqrt(x)*a1
+        f = self.field
+        a0 = poly_trim([f.sqrt(c) for c in a[0::2]])
+        a1 = poly_trim([f.sqrt(c) for c in a[1::2]])
+        return poly_add(a0, poly_mulmod(f, self.sqrt_x, a1, self.g))
+
+    def error_locator(self, syndrome: List[int]):
+        """
+        Алгоритм Паттерсона: многочлен локаторов ошибок sigma = a^2 + x*b^2
+        """
+        f = self.field
+        T = poly_inv_mod(f, syndrome, self.g)
+        T_x = poly_add(T, [0, 1])
+        if not T_x:
+            return [0, 1]
+        R = self.poly_sqrt(T_x)
+
+        # Расширенный алгоритм Евклида до deg(a) <= t/2: a = b*R mod g
+        r0, r1 = list(self.g), R
+        b0, b1 = [], [1]
+        while poly_deg(r1) > self.t // 2:
+            q, r = poly_divmod(f, r0, r1)
+            r0, r1 = r1, r
+            b0, b1 = b1, poly_add(b0, poly_mul(f, q, b1))
+        return poly_add(poly_sqr(f, r1), [0] + poly_sqr(f, b1))
+
+    def decode(self, received: np.ndarray):
+        """
+        Исправление до t ошибок. Возвращает кодовое слово
+        (или исходный вектор, если декодировать не удалось)
+        """
+        received = np.asarray(received) % 2
+        syndrome = self.syndrome(received)
+        if not syndrome:
+            return received
+
+        sigma = self.error_locator(syndrome)
+        values = poly_eval_vec(self.field, sigma, self.support)
+        error_positions = np.flatnonzero(values == 0)
+        if len(error_positions) != poly_deg(sigma):
+            return received
+
+        corrected = received.copy()
+        corrected[error_positions] ^= 1
+        return corrected
+
+
+def field_degree(n: int):
+    """
+    Минимальная степень m, при которой в GF(2^m) хватает элементов для носителя длины n
+    """
+    return max(2, (n - 1).bit_length())
+
+
+def generate_goppa_code(n: int, t: int, m: int = None):
+    if t < 2:
+        raise ValueError("Степень многочлена Гоппы t должна быть не меньше 2: "
+                         "многочлен степени 1 имеет корень в GF(2^m)")
+    if m is None:
+        m = field_degree(n)
+    field = GF2m(m)
+    if n > field.size:
+        raise ValueError(f"Длина кода n={n} больше размера поля 2^{m}")
+    if n <= m * t:
+        raise ValueError("Слишком большое t: размерность кода n - m*t должна быть положительной")
+
+    g = generate_goppa_polynomial(field, t)
+    support = random.sample(range(field.size), n)
+    return GoppaCode(m, g, support)
@@ -1,20 +1,111 @@
 import numpy as np
-import random
-from typing import Tuple, List
+import hashlib
+import io
+import os
+import struct
+from math import comb
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, BinaryIO
+from goppa import GoppaCode, generate_goppa_code, field_degree
+
+# Двоичный контейнер шифротекста: заголовок (сигнатура, версия, n, k, t, длина
+# исходных данных в байтах), затем блоки шифротекста, упакованные по 8 бит в байт.
+# Версия 2: блоки McEliece маскируются хешем вектора ошибок (см. error_mask)
+CONTAINER_MAGIC = b"MCEL"
+CONTAINER_VERSION = 2
+CONTAINER_HEADER = struct.Struct(">4sBIIIQ")
+# Количество блоков, обрабатываемых за один проход при потоковом шифровании (кратно 8,
+# чтобы k * CHUNK_BLOCKS бит всегда составляли целое число байт)
+CHUNK_BLOCKS = 1024
+
+# Файлы ключей: заголовок, затем матрицы в виде упакованных бит (строки выровнены по байту).
+# Упакованные матрицы используются прямо из np.memmap (XOR строк), без распаковки.
+# Сигнатура определяет схему: McEliece (MCPK/MCSK) или Нидеррайтер (NDPK/NDSK)
+PUBLIC_KEY_MAGIC = b"MCPK"
+PRIVATE_KEY_MAGIC = b"MCSK"
+KEY_VERSION = 4
+# сигнатура, версия, тип кода, n, k, t, m (степень поля для кода Гоппы)
+KEY_HEADER = struct.Struct(">4sBBIIII")
+CODE_TYPES = {"random": 0, "goppa": 1}
+
+
+def gf2_dot(a: np.ndarray, b: np.ndarray):
+    """
+    Произведение двоичных матриц по модулю 2 через BLAS во float32
+    (суммы не превышают внутренней размерности < 2^24, поэтому точные)
+    """
+    return np.dot(np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)).astype(int) % 2
+
+
+def gf2_xor_rows(bits: np.ndarray, packed: np.ndarray, cols: int):
+    """
+    Произведение bits (blocks x rows) на матрицу rows x cols по модулю 2, где матрица
+    задана упакованными строками: для каждого блока - XOR строк, выбранных его единичными битами.
+    Распаковывается только результат, сама матрица остаётся упакованной
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    acc = np.zeros((bits.shape[0], packed.shape[1]), dtype=np.uint8)
+    for i in range(packed.shape[0]):
+        # 0 - 1 = 255 в uint8: маска всей строки для блоков с единицей в бите i
+        acc ^= packed[i] & (np.uint8(0) - bits[:, i])[:, None]
+    return np.unpackbits(acc, axis=1, count=cols).astype(int)
+
 
 class McElieceCryptosystem:
-    def __init__(self, n: int = 64, k: int = 32, t: int = 5):
+    def __init__(self, n: int = 64, k: int = 32, t: int = 5, code: str = "random"):
+        """
+        code = "random" - случайный систематический код (декодирование перебором)
+        code = "goppa" - двоичный код Гоппы (декодирование Паттерсона),
+        в этом случае k вычисляется как n - m*t, где 2^m >= n
+        """
+        if code not in ("random", "goppa"):
+            raise ValueError(f"Неизвестный тип кода: {code}")
         self.n = n  # длина закодированного сообщения
         self.k = k  # длина исходного сообщения
         self.t = t  # количество ошибок для добавления
+        self.code = code
+        if code == "goppa":
+            self.k = n - field_degree(n) * t
         
         self.G = None  
         self.S = None  
         self.P = None  
         self.G1 = None 
+        self.Q = None  # избыточная часть открытого ключа в систематическом виде [I | Q]
         self.H = None  
+        self.S_inv = None
+        # упакованные по 8 бит строки Q и S^(-1): ими пользуются шифрование и расшифрование
+        self.Q_packed = None
+        self.S_inv_packed = None
+        self.perm = None
+        self.goppa: GoppaCode = None
+
+    # Сигнатуры двоичного контейнера шифротекста и файлов ключей
+    container_magic = CONTAINER_MAGIC
+    public_key_magic = PUBLIC_KEY_MAGIC
+    private_key_magic = PRIVATE_KEY_MAGIC
+
+    @property
+    def plain_block_bits(self):
+        """
+        Длина блока открытого текста в битах
+        """
+        return self.k
+
+    @property
+    def cipher_block_bits(self):
+        """
+        Длина блока шифротекста в битах
+        """
+        return self.n
         
     def generate_generator_matrix(self):
+        if self.code == "goppa":
+            self.goppa = generate_goppa_code(self.n, self.t)
+            self.k = self.goppa.k
+            return self.goppa.G, self.goppa.H
+
         # гарантирует, что k бит соответствуют исходному слову
         k_eye = np.eye(self.k, dtype=int)
         
@@ -88,69 +179,113 @@ class McElieceCryptosystem:
             if pivot_row != col:
                 augmented[[col, pivot_row]] = augmented[[pivot_row, col]]
             
-            # Обнуляем все остальные элементы в столбце
-            for row in range(n):
-                if row != col and augmented[row, col] == 1:
-                    augmented[row] = (augmented[row] + augmented[col]) % 2
+            # Обнуляем все остальные элементы в столбце (сразу всеми строками)
+            rows = augmented[:, col] == 1
+            rows[col] = False
+            augmented[rows] = (augmented[rows] + augmented[col]) % 2
         
         # Извлекаем обратную матрицу
         return augmented[:, n:].astype(int)
     
     def generate_keys(self):
         """
-        Открытый ключ (G1, t) и секретный ключ (S, G, P)
+        Открытый ключ (Q, t), где G1 = [I | Q], и секретный ключ (S, G, P)
         """
         # Шаг 1: Порождающая матрица G и проверочная матрица H
         self.G, self.H = self.generate_generator_matrix()
         
         # Шаг 2: Случайная двоичная невырожденная матрица S
         self.S = self.generate_invertible_matrix(self.k)
+        S_inv = self.matrix_inverse(self.S)
         
-        # Шаг 3: Случайная подстановочной матрица P
-        self.P = self.generate_permutation_matrix(self.n)
-        
-        # Шаг 4: Открытй ключ G1 = S * G * P
-        temp = np.dot(self.S, self.G) % 2
-        self.G1 = np.dot(temp, self.P) % 2
+        temp = gf2_dot(self.S, self.G)
+        while True:
+            # Шаг 3: Случайная подстановочной матрица P
+            self.P = self.generate_permutation_matrix(self.n)
+            
+            # Шаг 4: Открытй ключ G1 = S * G * P
+            G1 = gf2_dot(temp, self.P)
+
+            # Шаг 5: Систематический вид A^(-1) * G1 = [I | Q], где A - первые k столбцов G1.
+            # Если A вырождена, выбираем другую перестановку
+            A = G1[:, :self.k]
+            try:
+                A_inv = self.matrix_inverse(A)
+            except ValueError:
+                continue
+            break
+
+        # Это тот же ключ с матрицей S' = A^(-1) * S, поэтому S'^(-1) = S^(-1) * A
+        self.G1 = gf2_dot(A_inv, G1)
+        self.Q = self.G1[:, self.k:].copy()
+        self.S = gf2_dot(A_inv, self.S)
+
+        # Обратные матрицы нужны для каждого блока, считаем их один раз
+        self.S_inv = gf2_dot(S_inv, A)
+        self.Q_packed = np.packbits(self.Q.astype(np.uint8), axis=1)
+        self.S_inv_packed = np.packbits(self.S_inv.astype(np.uint8), axis=1)
+        # P = E[perm], поэтому C * P^(-1) = C * P^T - это просто выборка C[perm]
+        self.perm = self.P.argmax(axis=1)
         
-        return (self.G1, self.t)
+        return (self.Q, self.t)
     
-    def generate_error_vector(self):
+    def generate_error_vectors(self, count: int):
         """
-        Генерация случайного вектора ошибок Z длины n (длина кодового слова) 
-        (содержит ровно t единиц)
+        Сразу count векторов ошибок (матрица count x n, в каждой строке ровно t единиц):
+        позиции ошибок - индексы t наименьших случайных чисел строки
         """
-        z = np.zeros(self.n, dtype=int)
-        error_positions = random.sample(range(self.n), self.t)
-        z[error_positions] = 1
-        return z
+        noise = np.random.random((count, self.n))
+        error_positions = np.argpartition(noise, self.t - 1, axis=1)[:, :self.t]
+        Z = np.zeros((count, self.n), dtype=int)
+        np.put_along_axis(Z, error_positions, 1, axis=1)
+        return Z
     
+    def bytes_to_binary(self, data: bytes):
+        return np.unpackbits(np.frombuffer(data, dtype=np.uint8)).astype(int)
+
+    def binary_to_bytes(self, binary: np.ndarray):
+        binary = np.asarray(binary, dtype=np.uint8)
+        return np.packbits(binary[:len(binary) // 8 * 8]).tobytes()
+
     def text_to_binary(self, text: str):
-        binary = []
-        for char in text:
-            byte_val = ord(char)
-            bits = [int(b) for b in format(byte_val, '08b')]
-            binary.extend(bits)
-        return binary
+        return self.bytes_to_binary(text.encode('utf-8'))
     
     def binary_to_text(self, binary: List[int]):
-        text = ""
-        for i in range(0, len(binary), 8):
-            byte_bits = binary[i:i+8]
-            if len(byte_bits) == 8:
-                byte_val = int(''.join(map(str, byte_bits)), 2)
-                text += chr(byte_val)
-        return text
+        return self.binary_to_bytes(binary).decode('utf-8')
     
     def encrypt_block(self, message_block: np.ndarray):
         """
-        C = M * G1 + Z
+        C = (M + error_mask(Z)) * G1 + Z
         """
-        z = self.generate_error_vector()
-        
-        c = (np.dot(message_block, self.G1) + z) % 2
-        
-        return c
+        return self.encrypt_blocks(np.asarray(message_block)[None])[0]
+
+    def error_mask(self, Z: np.ndarray):
+        """
+        Маска k бит для каждого вектора ошибок: SHAKE-256 от упакованной строки Z.
+        В систематическом виде первые k бит шифротекста - это сами биты сообщения,
+        искажённые только в t позициях, поэтому сообщение перед кодированием
+        складывается с маской (преобразование в духе Кобары-Имаи). Вектор ошибок
+        известен только владельцу секретного ключа после декодирования.
+        Защищает открытый текст от прочтения, но не от активных атак (подмены шифротекста)
+        """
+        packed = np.packbits(np.asarray(Z, dtype=np.uint8), axis=1)
+        mask_bytes = -(-self.k // 8)
+        masks = b"".join(hashlib.shake_256(row.tobytes()).digest(mask_bytes) for row in packed)
+        masks = np.frombuffer(masks, dtype=np.uint8).reshape(-1, mask_bytes)
+        return np.unpackbits(masks, axis=1, count=self.k).astype(int)
+
+    def encrypt_blocks(self, message_blocks: np.ndarray):
+        """
+        C = M' * [I | Q] + Z = [M' | M' * Q] + Z сразу для всех блоков (M - матрица blocks x k),
+        где M' = M + error_mask(Z). M' * Q считается XOR упакованных строк Q,
+        так что ключ из файла не распаковывается
+        """
+        M = np.asarray(message_blocks, dtype=int)
+        Z = self.generate_error_vectors(M.shape[0])
+        M = (M + self.error_mask(Z)) % 2
+        redundancy = gf2_xor_rows(M, self.Q_packed, self.n - self.k)
+        C = np.hstack([M, redundancy])
+        return (C + Z) % 2
     
     def encrypt(self, plaintext: str):
         print("Начало шифрования")
@@ -158,33 +293,37 @@ class McElieceCryptosystem:
         binary = self.text_to_binary(plaintext)
         bin_len = len(binary)
         
-        encrypted = []
-        num_blocks = 0
+        # Дополняем последний блок нулями и разбиваем сообщение на матрицу blocks x k
+        block_bits = self.plain_block_bits
+        num_blocks = -(-bin_len // block_bits)
+        padded = np.zeros(num_blocks * block_bits, dtype=int)
+        padded[:bin_len] = binary
         
-        for i in range(0, len(binary), self.k):
-            block = binary[i:i+self.k]
-            
-            # Дополняем последний блок нулями
-            if len(block) < self.k:
-                block.extend([0] * (self.k - len(block)))
-            
-            block_array = np.array(block, dtype=int)
-            encrypted_block = self.encrypt_block(block_array)
-            encrypted.extend(encrypted_block.tolist())
-            num_blocks += 1
+        encrypted = self.encrypt_blocks(padded.reshape(num_blocks, block_bits))
         
-        return encrypted, bin_len
+        return encrypted.ravel(), bin_len
     
     def syndrome_decode(self, received: np.ndarray):
         """
         ДЕКОДИРОВАНИЕ С ИСПРАВЛЕНИЕМ ОШИБОК
         """
+        return self.correct_errors(received)[:self.k]
+
+    def correct_errors(self, received: np.ndarray):
+        """
+        Исправление ошибок: возвращает ближайшее кодовое слово
+        (или сам вектор, если исправить не удалось)
+        """
         # Вычисляем месторасположение ошибок
         syndrome = np.dot(received, self.H.T) % 2
         
         # Если синдром нулевой - ошибок нет
         if np.all(syndrome == 0):
-            return received[:self.k]
+            return received
+
+        # Для кода Гоппы - полиномиальное декодирование Паттерсона
+        if self.goppa is not None:
+            return self.goppa.decode(received)
         
         # Пытаемся исправить ошибки методом перебора для малых t
         if self.t <= 10:
@@ -202,75 +341,431 @@ class McElieceCryptosystem:
                     test_syndrome = np.dot(corrected, self.H.T) % 2
                     
                     if np.all(test_syndrome == 0):
-                        return corrected[:self.k]
+                        return corrected
         
-        # Если не получилось исправить, возвращаем первые k бит
-        return received[:self.k]
+        # Если не получилось исправить, возвращаем принятый вектор
+        return received
     
     def decrypt_block(self, cipher_block: np.ndarray):
         """
         1. C1 = C * P^(-1)
         2. Декодирование C1 с использованием алгоритма для G -> получаем M1
-        3. M = M1 * S^(-1)
+        3. M = M1 * S^(-1) + error_mask(Z)
         """
-        # Шаг 1: Ставим на место столбцы нашей матрицы P^(-1)
-        P_inv = self.matrix_inverse(self.P)
-        c1 = np.dot(cipher_block, P_inv) % 2
-        
-        # Шаг 2: Декодируем C1
-        # C1 = M1 * G + e, где e - вектор ошибок
-        # Используем алгоритм декодирования
-        m1 = self.syndrome_decode(c1)
-        
-        # Шаг 3: Вычисляем M = M1 * S^(-1)
-        S_inv = self.matrix_inverse(self.S)
-        m = np.dot(m1, S_inv) % 2
-        
-        return m
+        return self.decrypt_blocks(np.asarray(cipher_block)[None])[0]
+    
+    def decrypt_blocks(self, cipher_blocks: np.ndarray):
+        """
+        Расшифрование матрицы blocks x n: перестановка и умножение на S^(-1)
+        выполняются сразу для всех блоков, декодирование - по блокам.
+        Разность C1 с кодовым словом - вектор ошибок Z * P^(-1), по нему снимается маска
+        """
+        C = np.asarray(cipher_blocks, dtype=int)
+        C1 = C[:, self.perm] % 2
+        codewords = np.array([self.correct_errors(c1) for c1 in C1], dtype=int).reshape(-1, self.n)
+        Z = np.zeros_like(C1)
+        Z[:, self.perm] = (C1 + codewords) % 2
+        M = gf2_xor_rows(codewords[:, :self.k], self.S_inv_packed, self.k)
+        return (M + self.error_mask(Z)) % 2
     
     def decrypt(self, ciphertext: List[int], original_length: int):
         print(f"Начало расшифровывания")
         
-        decrypted = []
-        num_blocks = 0
-        
-        for i in range(0, len(ciphertext), self.n):
-            block = ciphertext[i:i+self.n]
-            
-            if len(block) == self.n:
-                block_array = np.array(block, dtype=int)
-                decrypted_block = self.decrypt_block(block_array)
-                decrypted.extend(decrypted_block.tolist())
-                num_blocks += 1
+        ciphertext = np.asarray(ciphertext, dtype=int)
+        block_bits = self.cipher_block_bits
+        num_blocks = len(ciphertext) // block_bits
+        decrypted = self.decrypt_blocks(ciphertext[:num_blocks * block_bits].reshape(num_blocks, block_bits))
         
         # Обрезаем до исходной длины
-        decrypted = decrypted[:original_length]
+        decrypted = decrypted.ravel()[:original_length]
         plaintext = self.binary_to_text(decrypted)
         
         return plaintext
 
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO, length: int):
+        """
+        Потоковое шифрование length байт из src в двоичный контейнер dst.
+        В памяти одновременно находится не больше CHUNK_BLOCKS блоков
+        """
+        dst.write(CONTAINER_HEADER.pack(self.container_magic, CONTAINER_VERSION, self.n, self.k, self.t, length))
+        block_bits = self.plain_block_bits
+        chunk_bytes = block_bits * CHUNK_BLOCKS // 8
+        remaining = length
+        while remaining > 0:
+            chunk = src.read(min(chunk_bytes, remaining))
+            if not chunk:
+                raise ValueError("Входной поток короче заявленной длины")
+            remaining -= len(chunk)
+
+            bits = self.bytes_to_binary(chunk)
+            num_blocks = -(-len(bits) // block_bits)
+            padded = np.zeros(num_blocks * block_bits, dtype=int)
+            padded[:len(bits)] = bits
+
+            encrypted = self.encrypt_blocks(padded.reshape(num_blocks, block_bits))
+            dst.write(np.packbits(encrypted.astype(np.uint8), axis=1).tobytes())
+
+    def read_container_header(self, src: BinaryIO):
+        header = src.read(CONTAINER_HEADER.size)
+        if len(header) != CONTAINER_HEADER.size:
+            raise ValueError("Повреждённый заголовок контейнера")
+        magic, version, n, k, t, length = CONTAINER_HEADER.unpack(header)
+        if magic != self.container_magic or version != CONTAINER_VERSION:
+            raise ValueError("Неизвестный формат контейнера")
+        if (n, k, t) != (self.n, self.k, self.t):
+            raise ValueError(f"Контейнер зашифрован с параметрами n={n}, k={k}, t={t}")
+        return length
+
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO):
+        """
+        Потоковое расшифрование двоичного контейнера src в dst
+        """
+        remaining = self.read_container_header(src)
+        for chunk in self.read_container_chunks(src, remaining, CHUNK_BLOCKS):
+            decrypted = self.decrypt_chunk(chunk)
+            dst.write(decrypted[:remaining])
+            remaining -= len(decrypted)
+
+    def read_container_chunks(self, src: BinaryIO, length: int, chunk_blocks: int):
+        """
+        Упакованные блоки шифротекста по chunk_blocks штук (chunk_blocks кратно 8,
+        чтобы каждый кусок расшифровывался в целое число байт)
+        """
+        block_bytes = -(-self.cipher_block_bits // 8)
+        chunk_plain_bytes = self.plain_block_bits * chunk_blocks // 8
+        remaining = length
+        while remaining > 0:
+            chunk = src.read(block_bytes * chunk_blocks)
+            if not chunk or len(chunk) % block_bytes:
+                raise ValueError("Контейнер обрезан")
+            yield chunk
+            remaining -= chunk_plain_bytes
+
+    def decrypt_chunk(self, chunk: bytes):
+        block_bytes = -(-self.cipher_block_bits // 8)
+        packed = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, block_bytes)
+        cipher_blocks = np.unpackbits(packed, axis=1, count=self.cipher_block_bits)
+        return self.binary_to_bytes(self.decrypt_blocks(cipher_blocks).ravel())
+
+    def encrypt_bytes(self, data: bytes):
+        dst = io.BytesIO()
+        self.encrypt_stream(io.BytesIO(data), dst, len(data))
+        return dst.getvalue()
+
+    def decrypt_bytes(self, container: bytes):
+        dst = io.BytesIO()
+        self.decrypt_stream(io.BytesIO(container), dst)
+        return dst.getvalue()
+
+
+class NiederreiterCryptosystem(McElieceCryptosystem):
+    """
+    Вариант Нидеррайтера: сообщение отображается в вектор ошибок e веса t,
+    шифротекст - его синдром c = H1 * e^T, где H1 = S * H * P (n - k бит вместо n)
+    """
+    container_magic = b"NIED"
+    public_key_magic = b"NDPK"
+    private_key_magic = b"NDSK"
+
+    def __init__(self, n: int = 64, k: int = 32, t: int = 5, code: str = "random"):
+        super().__init__(n=n, k=k, t=t, code=code)
+        self.H1 = None
+        # упакованные строки H1^T (n x (n - k)): синдром - XOR t строк по позициям ошибок
+        self.H1T_packed = None
+
+    @property
+    def plain_block_bits(self):
+        # Столько бит, сколько можно однозначно записать номером t-элементного подмножества из n
+        return comb(self.n, self.t).bit_length() - 1
+
+    @property
+    def cipher_block_bits(self):
+        return self.n - self.k
+
+    def generate_keys(self):
+        """
+        Открытый ключ (H1, t) и секретный ключ (S, H, P), S - матрица (n - k) x (n - k)
+        """
+        self.G, self.H = self.generate_generator_matrix()
+        self.S = self.generate_invertible_matrix(self.n - self.k)
+        self.P = self.generate_permutation_matrix(self.n)
+
+        # Открытый ключ H1 = S * H * P
+        temp = np.dot(self.S, self.H) % 2
+        self.H1 = np.dot(temp, self.P) % 2
+
+        self.S_inv = self.matrix_inverse(self.S)
+        self.H1T_packed = np.packbits(self.H1.T.astype(np.uint8), axis=1)
+        # S^(-1) * c = c * (S^(-1))^T, поэтому хранятся строки транспонированной матрицы
+        self.S_inv_packed = np.packbits(self.S_inv.T.astype(np.uint8), axis=1)
+        self.perm = self.P.argmax(axis=1)
+
+        return (self.H1, self.t)
+
+    def encode_constant_weight(self, value: int):
+        """
+        Номер value < C(n, t) -> позиции единиц вектора веса t
+        (комбинаторная система счисления: value = C(c_t, t) + ... + C(c_1, 1))
+        """
+        positions = []
+        c = self.n - 1
+        for i in range(self.t, 0, -1):
+            binom = comb(c, i)
+            while binom > value:
+                # C(c - 1, i) = C(c, i) * (c - i) / c
+                binom = binom * (c - i) // c
+                c -= 1
+            positions.append(c)
+            value -= binom
+            c -= 1
+        return positions
+
+    def decode_constant_weight(self, positions):
+        return sum(comb(int(c), i + 1) for i, c in enumerate(sorted(positions)))
+
+    def encrypt_blocks(self, message_blocks: np.ndarray):
+        """
+        Синдром - сумма t столбцов H1 (строк H1^T), соответствующих позициям ошибок
+        """
+        M = np.asarray(message_blocks, dtype=np.uint8)
+        if M.shape[0] == 0:
+            return np.zeros((0, self.cipher_block_bits), dtype=int)
+        # Число из бит блока, старший бит первый
+        values = [int.from_bytes(np.packbits(row).tobytes(), 'big') >> (-len(row) % 8) for row in M]
+        positions = np.array([self.encode_constant_weight(v) for v in values], dtype=np.int64)
+        syndromes = np.bitwise_xor.reduce(self.H1T_packed[positions], axis=1)
+        return np.unpackbits(syndromes, axis=1, count=self.cipher_block_bits).astype(int)
+
+    def decrypt_blocks(self, cipher_blocks: np.ndarray):
+        """
+        1. S^(-1) * c = H * (P * e^T)
+        2. Вектор [0 | s] имеет синдром s относительно H = [B | I]; декодер находит
+           ближайшее кодовое слово, разность с ним - вектор ошибок P * e^T
+        3. e = P^(-1) * (P * e^T), по позициям единиц восстанавливаем номер сообщения
+        """
+        C = np.asarray(cipher_blocks, dtype=int)
+        syndromes = gf2_xor_rows(C, self.S_inv_packed, self.cipher_block_bits)
+        block_bits = self.plain_block_bits
+
+        M = np.zeros((C.shape[0], block_bits), dtype=int)
+        for i, syndrome in enumerate(syndromes):
+            x = np.zeros(self.n, dtype=int)
+            x[self.k:] = syndrome
+            y = (x + self.correct_errors(x)) % 2
+            e = np.zeros(self.n, dtype=int)
+            e[self.perm] = y
+            value = self.decode_constant_weight(np.flatnonzero(e))
+            bits = [int(b) for b in format(value, f'0{block_bits}b')[-block_bits:]]
+            M[i] = bits
+        return M
+
+    def decrypt_block(self, cipher_block: np.ndarray):
+        return self.decrypt_blocks(np.asarray(cipher_block)[None])[0]
+
+
+def pack_matrix(matrix: np.ndarray):
+    return np.packbits(np.asarray(matrix, dtype=np.uint8), axis=1).tobytes()
+
+
+def packed_matrix(buffer, offset: int, rows: int, cols: int):
+    """
+    Упакованная матрица rows x cols (по строке на ceil(cols / 8) байт) как вид на буфер
+    (bytes или np.memmap) без копирования. Возвращает матрицу и смещение сразу за ней
+    """
+    row_bytes = -(-cols // 8)
+    size = rows * row_bytes
+    if offset + size > len(buffer):
+        raise ValueError("Файл ключа обрезан")
+    packed = np.frombuffer(buffer, dtype=np.uint8, count=size, offset=offset).reshape(rows, row_bytes)
+    return packed, offset + size
+
+
+def unpack_matrix(buffer, offset: int, rows: int, cols: int):
+    """
+    Распакованная матрица из 0 и 1 (копия в памяти процесса) и смещение сразу за ней
+    """
+    packed, offset = packed_matrix(buffer, offset, rows, cols)
+    return np.unpackbits(packed, axis=1, count=cols).astype(int), offset
+
+
+def read_key_header(buffer, private: bool):
+    """
+    Создаёт объект схемы, указанной сигнатурой файла (McEliece или Нидеррайтер),
+    с параметрами из заголовка
+    """
+    if len(buffer) < KEY_HEADER.size:
+        raise ValueError("Повреждённый файл ключа")
+    key_magic, version, code_type, n, k, t, m = KEY_HEADER.unpack(bytes(buffer[:KEY_HEADER.size]))
+    schemes = {(cls.private_key_magic if private else cls.public_key_magic): cls
+               for cls in (McElieceCryptosystem, NiederreiterCryptosystem)}
+    if key_magic not in schemes or version != KEY_VERSION:
+        raise ValueError("Неизвестный формат файла ключа")
+    codes = {v: name for name, v in CODE_TYPES.items()}
+    if code_type not in codes:
+        raise ValueError(f"Неизвестный тип кода в файле ключа: {code_type}")
+    mceliece = schemes[key_magic](n=n, k=k, t=t, code=codes[code_type])
+    mceliece.k = k
+    return mceliece, m
+
+
+def scrambler_size(mceliece: McElieceCryptosystem):
+    """
+    Размер матрицы S: k x k для McEliece, (n - k) x (n - k) для Нидеррайтера
+    """
+    if isinstance(mceliece, NiederreiterCryptosystem):
+        return mceliece.n - mceliece.k
+    return mceliece.k
+
+
+def public_key_to_bytes(mceliece: McElieceCryptosystem):
+    """
+    Открытый ключ McEliece (Q, t): хранится только избыточная часть k x (n - k) матрицы G1 = [I | Q].
+    Открытый ключ Нидеррайтера (H1, t): строки H1^T, n x (n - k)
+    """
+    header = KEY_HEADER.pack(mceliece.public_key_magic, KEY_VERSION, CODE_TYPES[mceliece.code],
+                             mceliece.n, mceliece.k, mceliece.t, 0)
+    if isinstance(mceliece, NiederreiterCryptosystem):
+        return header + np.ascontiguousarray(mceliece.H1T_packed).tobytes()
+    return header + np.ascontiguousarray(mceliece.Q_packed).tobytes()
+
+
+def public_key_from_bytes(buffer):
+    mceliece, _ = read_key_header(buffer, private=False)
+    n, k = mceliece.n, mceliece.k
+    if isinstance(mceliece, NiederreiterCryptosystem):
+        mceliece.H1T_packed, _ = packed_matrix(buffer, KEY_HEADER.size, n, n - k)
+    else:
+        mceliece.Q_packed, _ = packed_matrix(buffer, KEY_HEADER.size, k, n - k)
+    return mceliece
+
+
+def private_key_to_bytes(mceliece: McElieceCryptosystem):
+    """
+    Секретный ключ: S^(-1) (для Нидеррайтера - транспонированная), перестановка P
+    и данные для декодирования: проверочная матрица H случайного кода или многочлен g,
+    носитель L и систематическая H кода Гоппы
+    (с готовой H код при загрузке не приводится к систематическому виду заново)
+    """
+    goppa = mceliece.goppa
+    m = goppa.m if goppa is not None else 0
+    parts = [
+        KEY_HEADER.pack(mceliece.private_key_magic, KEY_VERSION, CODE_TYPES[mceliece.code],
+                        mceliece.n, mceliece.k, mceliece.t, m),
+        np.ascontiguousarray(mceliece.S_inv_packed).tobytes(),
+        np.asarray(mceliece.perm, dtype='<u4').tobytes(),
+    ]
+    if goppa is not None:
+        parts.append(np.asarray(goppa.g, dtype='<u2').tobytes())
+        parts.append(np.asarray(goppa.support, dtype='<u2').tobytes())
+        parts.append(pack_matrix(goppa.H))
+    else:
+        parts.append(pack_matrix(mceliece.H))
+    return b"".join(parts)
+
+
+def private_key_from_bytes(buffer):
+    mceliece, m = read_key_header(buffer, private=True)
+    n, k, t = mceliece.n, mceliece.k, mceliece.t
+
+    size = scrambler_size(mceliece)
+    mceliece.S_inv_packed, offset = packed_matrix(buffer, KEY_HEADER.size, size, size)
+    mceliece.perm = np.frombuffer(buffer, dtype='<u4', count=n, offset=offset).astype(np.int64)
+    offset += 4 * n
+
+    if mceliece.code == "goppa":
+        g = np.frombuffer(buffer, dtype='<u2', count=t + 1, offset=offset).tolist()
+        offset += 2 * (t + 1)
+        support = np.frombuffer(buffer, dtype='<u2', count=n, offset=offset)
+        offset += 2 * n
+        H, _ = unpack_matrix(buffer, offset, n - k, n)
+        mceliece.goppa = GoppaCode(m, g, support, H=H)
+        mceliece.H = mceliece.goppa.H
+    else:
+        mceliece.H, _ = unpack_matrix(buffer, offset, n - k, n)
+    return mceliece
+
+
+def save_public_key(mceliece: McElieceCryptosystem, path: str):
+    with open(path, 'wb') as f:
+        f.write(public_key_to_bytes(mceliece))
+
+
+def save_private_key(mceliece: McElieceCryptosystem, path: str):
+    with open(path, 'wb') as f:
+        f.write(private_key_to_bytes(mceliece))
+
+
+def load_public_key(path: str):
+    """
+    Файл отображается в память, и шифрование работает прямо с упакованной Q (или H1^T):
+    процессы, загружающие один ключ, читают одну и ту же копию из страничного кэша
+    """
+    return public_key_from_bytes(np.memmap(path, dtype=np.uint8, mode='r'))
+
+
+def load_private_key(path: str):
+    """
+    S^(-1) используется из отображённого файла, а проверочная матрица и таблицы
+    декодера строятся в памяти каждого процесса
+    """
+    return private_key_from_bytes(np.memmap(path, dtype=np.uint8, mode='r'))
+
+
+# Секретный ключ в процессе-исполнителе: передаётся один раз при запуске процесса
+_worker_mceliece: McElieceCryptosystem = None
+
+
+def _init_decrypt_worker(private_key: bytes):
+    global _worker_mceliece
+    _worker_mceliece = private_key_from_bytes(private_key)
+
+
+def _decrypt_worker_chunk(chunk: bytes):
+    return _worker_mceliece.decrypt_chunk(chunk)
+
+
+def decrypt_stream_parallel(src: BinaryIO, dst: BinaryIO, mceliece: McElieceCryptosystem,
+                            workers: int = None, chunk_blocks: int = 128):
+    """
+    Параллельное расшифрование контейнера пулом процессов. Блоки независимы,
+    поэтому куски по chunk_blocks блоков расшифровываются в разных процессах
+    и записываются в исходном порядке. Одновременно в обработке не больше
+    2 * workers кусков, так что расход памяти ограничен
+    """
+    if chunk_blocks % 8:
+        raise ValueError("chunk_blocks должно быть кратно 8")
+    workers = workers or os.cpu_count() or 1
+    remaining = mceliece.read_container_header(src)
+    chunks = mceliece.read_container_chunks(src, remaining, chunk_blocks)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_decrypt_worker,
+                             initargs=(private_key_to_bytes(mceliece),)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_decrypt_worker_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                decrypted = pending.popleft().result()
+                dst.write(decrypted[:remaining])
+                remaining -= len(decrypted)
+        while pending:
+            decrypted = pending.popleft().result()
+            dst.write(decrypted[:remaining])
+            remaining -= len(decrypted)
+
+
+def decrypt_file_parallel(input_file: str, output_file: str, mceliece: McElieceCryptosystem, workers: int = None):
+    with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
+        decrypt_stream_parallel(src, dst, mceliece, workers)
+
 
 def encrypt_file(input_file: str, output_file: str, mceliece: McElieceCryptosystem):
-    with open(input_file, 'r', encoding='utf-8') as f:
-        plaintext = f.read()
-    
-    ciphertext, original_bit_length = mceliece.encrypt(plaintext)
-    
-    with open(output_file, 'w') as f:
-        f.write(f"{original_bit_length}\n")
-        f.write(''.join(map(str, ciphertext)))
+    with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
+        mceliece.encrypt_stream(src, dst, os.fstat(src.fileno()).st_size)
 
 
 def decrypt_file(input_file: str, output_file: str, mceliece: McElieceCryptosystem):
-    with open(input_file, 'r') as f:
-        lines = f.readlines()
-        original_length = int(lines[0].strip())
-        ciphertext = [int(bit) for bit in lines[1].strip()]
-    
-    plaintext = mceliece.decrypt(ciphertext, original_length)
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(plaintext)
+    with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
+        mceliece.decrypt_stream(src, dst)
 
 
 
@@ -279,11 +774,13 @@ if __name__ == "__main__":
     # n > k, потому что k - длина исходного сообщения, n = k + дополнение 
     mceliece = McElieceCryptosystem(n=64, k=32, t=3)
     public_key, t = mceliece.generate_keys()
+    save_public_key(mceliece, 'public_key.bin')
+    save_private_key(mceliece, 'private_key.bin')
     
     start = time.time()
-    encrypt_file('plaintext.txt', 'encrypted.txt', mceliece)
+    encrypt_file('plaintext.txt', 'encrypted.bin', load_public_key('public_key.bin'))
     end_enc = time.time()
-    decrypt_file('encrypted.txt', 'decrypted.txt', mceliece)
+    decrypt_file('encrypted.bin', 'decrypted.txt', load_private_key('private_key.bin'))
     end_dec = time.time()
     
     with open('plaintext.txt', 'r', encoding='utf-8') as f:
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from l5 import Streebog256, Streebog512, SHA1, hash_gost, sha1, streebog_batch
+from hash_files import hash_file
+
+# Контрольные примеры ГОСТ 34.11-2018 (хэш записан как число, старший байт первым)
+M1 = b"012345678901234567890123456789012345678901234567890123456789012"
+M2 = bytes.fromhex(
+    "fbe2e5f0eee3c820fbeafaebef20fffbf0e1e0f0f520e0ed20e8ece0ebe5f0f2f120fff0eeec20f120faf2fee5"
+    "e2202ce8f6f3ede220e8e6eee1e8f0f2d1202ce8f0f2e5e220e5d1")[::-1]
+GOST_VECTORS = [
+    (M1, 512, "486f64c1917879417fef082b3381a4e211c324f074654c38823a7b76f830ad00"
+              "fa1fbae42b1285c0352f227524bc9ab16254288dd6863dccd5b9f54a1ad0541b"),
+    (M1, 256, "00557be5e584fd52a449b16b0251d05d27f94ab76cbaa6da890b59d8ef1e159d"),
+    (M2, 512, "28fbc9bada033b1460642bdcddb90c3fb3e56c497ccd0f62b8a2ad4935e85f03"
+              "7613966de4ee00531ae60f3b5a47f8dae06915d5f2f194996fcabf2622e6881e"),
+    (M2, 256, "508f7e553c06501d749a66fc28c6cac0b005746d97537fa85d9e40904efed29d"),
+]
+
+# Контрольные примеры FIPS 180 для SHA-1
+SHA1_VECTORS = [
+    (b"", "da39a3ee5e6b4b0d3255bfef95601890afd80709"),
+    (b"abc", "a9993e364706816aba3e25717850c26c9cd0d89d"),
+    (b"abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq", "84983e441c3bd26ebaae4aa1f95129e5e54670f1"),
+]
+
+STREEBOG = {512: Streebog512, 256: Streebog256}
+
+# Размеры сообщений: от пустого до 100 МБ
+SIZES = [0, 1, 63, 64, 1024, 16 * 1024, 1 << 20, 10 << 20, 100 << 20]
+
+# Размер куска для инкрементального хэширования
+UPDATE_CHUNK = 64 * 1024
+
+# Число сообщений в пакете и наибольший размер сообщения для пакетного пути
+BATCH_COUNT = 256
+BATCH_MAX_SIZE = 16 * 1024
+
+
+def _file_digest(data: bytes, algorithm: str):
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(data)
+    try:
+        return bytes.fromhex(hash_file(f.name, algorithm))
+    finally:
+        os.unlink(f.name)
+
+
+def known_answer_tests():
+    """
+    Проверка всех путей хэширования на контрольных примерах; возвращает список ошибок
+    """
+    failures = []
+
+    def check(name, got, expected):
+        if got != expected:
+            failures.append(f"{name}: получено {got}, ожидалось {expected}")
+
+    for message, output, expected in GOST_VECTORS:
+        tag = f"ГОСТ-{output} ({len(message)} байт)"
+        check(f"{tag} hash_gost", hash_gost(message, output), int(expected, 16))
+        hasher = STREEBOG[output]()
+        for b in message:
+            hasher.update(bytes([b]))
+        check(f"{tag} update", hasher.digest()[::-1].hex(), expected)
+        check(f"{tag} batch", streebog_batch([message], output)[0][::-1].hex(), expected)
+        check(f"{tag} file", _file_digest(message, f"streebog{output}")[::-1].hex(), expected)
+
+    for message, expected in SHA1_VECTORS:
+        tag = f"SHA-1 ({len(message)} байт)"
+        check(f"{tag} sha1", int(sha1(message), 16), int(expected, 16))
+        hasher = SHA1()
+        for b in message:
+            hasher.update(bytes([b]))
+        check(f"{tag} update", hasher.hexdigest(), expected)
+        check(f"{tag} file", _file_digest(message, "sha1").hex(), expected)
+    return failures
+
+
+def _measure(func, min_time: float):
+    """
+    Повторяет func, пока не пройдёт min_time секунд (хотя бы один раз)
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls, elapsed
+
+
+def _oneshot(algorithm: str, data: bytes):
+    if algorithm == "sha1":
+        return lambda: sha1(data)
+    output = 512 if algorithm == "streebog512" else 256
+    return lambda: hash_gost(data, output)
+
+
+def _incremental(algorithm: str, data: bytes):
+    hasher_cls = {"streebog512": Streebog512, "streebog256": Streebog256, "sha1": SHA1}[algorithm]
+    view = memoryview(data)
+
+    def run():
+        hasher = hasher_cls()
+        for pos in range(0, len(view), UPDATE_CHUNK):
+            hasher.update(view[pos:pos + UPDATE_CHUNK])
+        return hasher.digest()
+    return run
+
+
+def benchmark(algorithms, sizes, paths, min_time: float = 1.0, log=None):
+    """
+    Результаты замеров: по записи на (алгоритм, путь, размер сообщения)
+    """
+    results = []
+
+    def record(algorithm, path, size, messages, calls, elapsed):
+        total = size * messages * calls
+        result = {
+            "algorithm": algorithm,
+            "path": path,
+            "size": size,
+            "messages": messages,
+            "calls": calls,
+            "seconds": elapsed,
+            "mb_per_s": total / elapsed / 1e6,
+            "latency_s": elapsed / calls,
+        }
+        results.append(result)
+        if log:
+            log(f"{algorithm:12} {path:12} {size:>10} Б  {result['mb_per_s']:10.4f} МБ/с  "
+                f"{result['latency_s'] * 1e3:12.3f} мс")
+
+    for size in sizes:
+        data = os.urandom(size)
+        file_path = None
+        if "file" in paths:
+            with tempfile.NamedTemporaryFile(delete=False) as f:
+                f.write(data)
+                file_path = f.name
+        try:
+            for algorithm in algorithms:
+                if "oneshot" in paths:
+                    record(algorithm, "oneshot", size, 1, *_measure(_oneshot(algorithm, data), min_time))
+                if "incremental" in paths:
+                    record(algorithm, "incremental", size, 1, *_measure(_incremental(algorithm, data), min_time))
+                if "file" in paths:
+                    record(algorithm, "file", size, 1,
+                           *_measure(lambda: hash_file(file_path, algorithm), min_time))
+                if "batch" in paths and algorithm != "sha1" and size <= BATCH_MAX_SIZE:
+                    output = 512 if algorithm == "streebog512" else 256
+                    messages = [data] * BATCH_COUNT
+                    record(algorithm, "batch", size, BATCH_COUNT,
+                           *_measure(lambda: streebog_batch(messages, output), min_time))
+        finally:
+            if file_path:
+                os.unlink(file_path)
+    return results
+
+
+def compare(old_results, new_results):
+    """
+    Отношение скоростей нового прогона к старому для совпадающих замеров
+    """
+    old = {(r["algorithm"], r["path"], r["size"]): r for r in old_results}
+    rows = []
+    for r in new_results:
+        key = (r["algorithm"], r["path"], r["size"])
+        if key in old and old[key]["latency_s"] > 0:
+            rows.append((key, old[key]["latency_s"] / r["latency_s"]))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры скорости ГОСТ 34.11-2018 и SHA-1")
+    parser.add_argument("-o", "--output", default=None, help="файл JSON для результатов")
+    parser.add_argument("--compare", default=None, help="JSON предыдущего прогона для сравнения")
+    parser.add_argument("-a", "--algorithm", dest="algorithms", action="append",
+                        choices=["streebog512", "streebog256", "sha1"], default=None)
+    parser.add_argument("-p", "--path", dest="paths", action="append",
+                        choices=["oneshot", "incremental", "batch", "file"], default=None)
+    parser.add_argument("--max-size", type=int, default=max(SIZES), help="наибольший размер сообщения в байтах")
+    parser.add_argument("--min-time", type=float, default=1.0, help="минимальное время замера в секундах")
+    args = parser.parse_args(argv)
+
+    failures = known_answer_tests()
+    if failures:
+        for failure in failures:
+            print(f"ОШИБКА {failure}", file=sys.stderr)
+        print("Контрольные примеры не пройдены, замеры не выполняются", file=sys.stderr)
+        return 1
+    print("Контрольные примеры пройдены")
+
+    algorithms = args.algorithms or ["streebog512", "streebog256", "sha1"]
+    paths = args.paths or ["oneshot", "incremental", "batch", "file"]
+    sizes = [size for size in SIZES if size <= args.max_size]
+    results = benchmark(algorithms, sizes, paths, args.min_time, log=print)
+
+    if args.output:
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old_results = json.load(f)["results"]
+        for (algorithm, path, size), speedup in compare(old_results, results):
+            print(f"{algorithm:12} {path:12} {size:>10} Б  x{speedup:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
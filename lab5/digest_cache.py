@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import time
+
+# Файл, изменённый только что, может измениться ещё раз в пределах того же значения
+# mtime, поэтому его хэш не кэшируется (как "racy" файлы в git)
+RACY_WINDOW_NS = 2 * 10**9
+
+
+class DigestCache:
+    """
+    Кэш хэшей файлов на SQLite. Запись действительна, пока совпадают
+    (путь, inode, размер, mtime_ns, алгоритм); при превышении max_entries
+    удаляются записи, которые дольше всего не использовались
+    """
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS digests (
+                path TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (path, algorithm)
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used)")
+        self.db.commit()
+
+    @staticmethod
+    def identity(path: str):
+        st = os.stat(path)
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def get(self, path: str, algorithm: str, identity=None):
+        path = os.path.abspath(path)
+        inode, size, mtime_ns = identity or self.identity(path)
+        row = self.db.execute(
+            "SELECT digest FROM digests WHERE path = ? AND algorithm = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+            (path, algorithm, inode, size, mtime_ns)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE digests SET last_used = ? WHERE path = ? AND algorithm = ?",
+                        (time.time(), path, algorithm))
+        return row[0]
+
+    def put(self, path: str, algorithm: str, digest: str, identity=None):
+        path = os.path.abspath(path)
+        inode, size, mtime_ns = identity or self.identity(path)
+        if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+            return
+        self.db.execute(
+            "INSERT OR REPLACE INTO digests (path, algorithm, inode, size, mtime_ns, digest, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, algorithm, inode, size, mtime_ns, digest, time.time()))
+
+    def evict(self):
+        count = self.db.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM digests WHERE rowid IN (SELECT rowid FROM digests ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,))
+
+    def close(self):
+        self.evict()
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,180 @@
+import argparse
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from l5 import Streebog256, Streebog512, SHA1, verify_file_integrity
+from digest_cache import DigestCache
+
+ALGORITHMS = {
+    "streebog256": Streebog256,
+    "streebog512": Streebog512,
+    "sha1": SHA1,
+}
+
+
+def hash_file(path: str, algorithm: str):
+    """
+    Хэш файла в виде hex-строки. Файл отображается в память,
+    поэтому хэш читает его блоками без копирования
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        hasher = ALGORITHMS[algorithm]()
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        return hasher.hexdigest()
+
+
+def _hash_task(args):
+    root, rel_path, algorithm = args
+    try:
+        return rel_path, hash_file(os.path.join(root, rel_path), algorithm), None
+    except OSError as e:
+        return rel_path, None, str(e)
+
+
+def walk_files(root: str):
+    """
+    Относительные пути всех файлов дерева в стабильном порядке
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            files.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return files
+
+
+def hash_files(root: str, rel_paths, algorithm: str, workers: int = None, cache: DigestCache = None):
+    """
+    Хэширование файлов пулом процессов. Возвращает словари {путь: хэш} и {путь: ошибка}.
+    Если передан кэш, неизменённые файлы не читаются
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+    workers = workers or os.cpu_count() or 1
+    digests, errors = {}, {}
+
+    identities = {}
+    to_hash = []
+    for rel_path in rel_paths:
+        if cache is not None:
+            full_path = os.path.join(root, rel_path)
+            try:
+                identities[rel_path] = cache.identity(full_path)
+            except OSError as e:
+                errors[rel_path] = str(e)
+                continue
+            cached = cache.get(full_path, algorithm, identities[rel_path])
+            if cached is not None:
+                digests[rel_path] = cached
+                continue
+        to_hash.append(rel_path)
+
+    tasks = [(root, rel_path, algorithm) for rel_path in to_hash]
+    chunksize = max(1, len(tasks) // (workers * 16))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rel_path, digest, error in pool.map(_hash_task, tasks, chunksize=chunksize):
+            if error is None:
+                digests[rel_path] = digest
+                if cache is not None:
+                    cache.put(os.path.join(root, rel_path), algorithm, digest, identities[rel_path])
+            else:
+                errors[rel_path] = error
+    return digests, errors
+
+
+def write_manifest(path: str, algorithm: str, digests: dict):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# algorithm: {algorithm}\n")
+        for rel_path in sorted(digests):
+            f.write(f"{digests[rel_path]}  {rel_path}\n")
+
+
+def read_manifest(path: str):
+    algorithm = None
+    digests = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line.startswith("# algorithm:"):
+                algorithm = line.split(":", 1)[1].strip()
+            elif line and not line.startswith("#"):
+                digest, rel_path = line.split("  ", 1)
+                digests[rel_path] = digest
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"В манифесте не указан известный алгоритм: {algorithm}")
+    return algorithm, digests
+
+
+def verify_tree(root: str, manifest_path: str, workers: int = None, cache: DigestCache = None):
+    """
+    Сверка дерева с манифестом: несовпавшие, отсутствующие и новые файлы
+    """
+    algorithm, expected = read_manifest(manifest_path)
+    present = set(walk_files(root))
+    to_check = [p for p in expected if p in present]
+    actual, errors = hash_files(root, to_check, algorithm, workers, cache)
+
+    mismatched = sorted(p for p, digest in actual.items() if not verify_file_integrity(digest, expected[p]))
+    missing = sorted(set(expected) - present)
+    extra = sorted(present - set(expected) - {os.path.relpath(manifest_path, root)})
+    return mismatched, missing, extra, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Хэширование дерева файлов и проверка по манифесту")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--cache", default=None, help="файл кэша хэшей (SQLite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_hash = sub.add_parser("hash", help="построить манифест")
+    p_hash.add_argument("root")
+    p_hash.add_argument("-o", "--output", required=True)
+    p_hash.add_argument("-a", "--algorithm", choices=sorted(ALGORITHMS), default="streebog256")
+
+    p_verify = sub.add_parser("verify", help="проверить дерево по манифесту")
+    p_verify.add_argument("root")
+    p_verify.add_argument("manifest")
+
+    args = parser.parse_args(argv)
+    cache = DigestCache(args.cache) if args.cache else None
+    try:
+        return run_command(args, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def run_command(args, cache: DigestCache):
+    if args.command == "hash":
+        skip = {os.path.abspath(args.output)}
+        if args.cache:
+            skip.add(os.path.abspath(args.cache))
+        files = [p for p in walk_files(args.root) if os.path.abspath(os.path.join(args.root, p)) not in skip]
+        digests, errors = hash_files(args.root, files, args.algorithm, args.workers, cache)
+        write_manifest(args.output, args.algorithm, digests)
+        for rel_path, error in sorted(errors.items()):
+            print(f"ОШИБКА {rel_path}: {error}", file=sys.stderr)
+        print(f"Хэшировано файлов: {len(digests)}")
+        return 1 if errors else 0
+
+    mismatched, missing, extra, errors = verify_tree(args.root, args.manifest, args.workers, cache)
+    for rel_path in mismatched:
+        print(f"НЕ СОВПАДАЕТ {rel_path}")
+    for rel_path in missing:
+        print(f"ОТСУТСТВУЕТ {rel_path}")
+    for rel_path in extra:
+        print(f"НОВЫЙ {rel_path}")
+    for rel_path, error in sorted(errors.items()):
+        print(f"ОШИБКА {rel_path}: {error}")
+    if mismatched or missing or errors:
+        return 1
+    print("Все файлы совпадают")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
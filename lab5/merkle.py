@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from hash_files import ALGORITHMS
+
+# Размер куска файла по умолчанию (1 МиБ)
+CHUNK_SIZE = 1 << 20
+
+# Префиксы разделяют хэши листьев и внутренних узлов дерева
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def hash_chunk(path: str, index: int, chunk_size: int, algorithm: str):
+    with open(path, 'rb') as f:
+        f.seek(index * chunk_size)
+        data = f.read(chunk_size)
+    hasher = ALGORITHMS[algorithm](LEAF_PREFIX)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _hash_chunk_task(args):
+    return hash_chunk(*args)
+
+
+def hash_chunks(path: str, indices, chunk_size: int, algorithm: str, workers: int = None):
+    """
+    Хэши выбранных кусков файла, посчитанные пулом процессов
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(path, i, chunk_size, algorithm) for i in indices]
+    if workers == 1 or len(tasks) <= 1:
+        return [_hash_chunk_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_hash_chunk_task, tasks))
+
+
+def merkle_root(leaves, algorithm: str):
+    """
+    Корень дерева: узел - хэш от пары дочерних, непарный узел поднимается на уровень выше
+    """
+    hasher_cls = ALGORITHMS[algorithm]
+    if not leaves:
+        return hasher_cls(LEAF_PREFIX).hexdigest()
+    level = [bytes.fromhex(x) for x in leaves]
+    while len(level) > 1:
+        next_level = []
+        for i in range(0, len(level) - 1, 2):
+            next_level.append(hasher_cls(NODE_PREFIX + level[i] + level[i + 1]).digest())
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+    return level[0].hex()
+
+
+def num_chunks(file_size: int, chunk_size: int):
+    return -(-file_size // chunk_size)
+
+
+def build_tree(path: str, chunk_size: int = CHUNK_SIZE, algorithm: str = "streebog256", workers: int = None):
+    file_size = os.path.getsize(path)
+    leaves = hash_chunks(path, range(num_chunks(file_size, chunk_size)), chunk_size, algorithm, workers)
+    return {
+        "algorithm": algorithm,
+        "chunk_size": chunk_size,
+        "file_size": file_size,
+        "root": merkle_root(leaves, algorithm),
+        "leaves": leaves,
+    }
+
+
+def save_tree(tree: dict, tree_path: str):
+    with open(tree_path, 'w', encoding='utf-8') as f:
+        json.dump(tree, f, indent=1)
+
+
+def load_tree(tree_path: str):
+    with open(tree_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_root(tree: dict, expected_root: str = None):
+    """
+    Список листьев должен сворачиваться в записанный корень, а корень - совпадать
+    с ожидаемым (опубликованным отдельно от файла дерева), если он задан
+    """
+    root = merkle_root(tree["leaves"], tree["algorithm"])
+    if root != tree["root"]:
+        raise ValueError("Листья дерева не соответствуют его корню")
+    if expected_root is not None and root != expected_root.lower():
+        raise ValueError(f"Корень дерева {root} не совпадает с ожидаемым")
+
+
+def verify_file(path: str, tree: dict, workers: int = None, expected_root: str = None):
+    """
+    Полная проверка файла: хэшируются все куски, возвращаются диапазоны байт
+    повреждённых кусков (пустой список - файл цел). Само дерево сначала
+    сверяется с корнем (check_root), иначе подменённые листья прошли бы проверку
+    """
+    check_root(tree, expected_root)
+    chunk_size, algorithm = tree["chunk_size"], tree["algorithm"]
+    file_size = os.path.getsize(path)
+    count = max(num_chunks(file_size, chunk_size), len(tree["leaves"]))
+    existing = num_chunks(file_size, chunk_size)
+    actual = hash_chunks(path, range(existing), chunk_size, algorithm, workers)
+
+    corrupted = []
+    for i in range(count):
+        expected = tree["leaves"][i] if i < len(tree["leaves"]) else None
+        got = actual[i] if i < existing else None
+        if expected != got:
+            start = i * chunk_size
+            end = min(start + chunk_size, max(file_size, tree["file_size"]))
+            corrupted.append((start, end))
+    return corrupted
+
+
+def update_tree(path: str, tree: dict, modified_ranges, workers: int = None):
+    """
+    Обновление дерева после изменения файла: перехэшируются только куски,
+    пересекающиеся с modified_ranges (и куски, появившиеся или изменившиеся из-за
+    смены размера файла).
+    Диапазонам верят на слово: остальные листья не проверяются, и новый корень
+    подтверждает любые изменения вне них. Поэтому обновлять дерево должен только
+    тот, кто сам вносил изменения; получатель файла проверяет его через verify
+    """
+    chunk_size, algorithm = tree["chunk_size"], tree["algorithm"]
+    file_size = os.path.getsize(path)
+    count = num_chunks(file_size, chunk_size)
+    old_count = len(tree["leaves"])
+
+    dirty = set()
+    for start, end in modified_ranges:
+        dirty.update(range(start // chunk_size, num_chunks(end, chunk_size)))
+    if file_size != tree["file_size"]:
+        # последний неполный кусок старого файла и все новые куски
+        dirty.update(range(max(0, min(old_count, count) - 1), count))
+    dirty = sorted(i for i in dirty if i < count)
+
+    leaves = tree["leaves"][:count] + [None] * max(0, count - old_count)
+    for i, digest in zip(dirty, hash_chunks(path, dirty, chunk_size, algorithm, workers)):
+        leaves[i] = digest
+
+    tree = dict(tree, file_size=file_size, leaves=leaves)
+    tree["root"] = merkle_root(leaves, algorithm)
+    return tree, dirty
+
+
+def parse_range(value: str):
+    start, end = value.split(":")
+    return int(start), int(end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Хэширование больших файлов деревом Меркла")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="число процессов")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="построить дерево хэшей файла")
+    p_build.add_argument("file")
+    p_build.add_argument("tree")
+    p_build.add_argument("-c", "--chunk-size", type=int, default=CHUNK_SIZE)
+    p_build.add_argument("-a", "--algorithm", choices=sorted(ALGORITHMS), default="streebog256")
+
+    p_verify = sub.add_parser("verify", help="проверить файл по дереву")
+    p_verify.add_argument("file")
+    p_verify.add_argument("tree")
+    p_verify.add_argument("--root", dest="expected_root", default=None,
+                          help="ожидаемый корень, полученный из доверенного источника")
+
+    p_update = sub.add_parser("update", help="перехэшировать только изменённые диапазоны "
+                                             "(для автора изменений, диапазоны не проверяются)")
+    p_update.add_argument("file")
+    p_update.add_argument("tree")
+    p_update.add_argument("-r", "--range", dest="ranges", type=parse_range, action="append", default=[],
+                          help="изменённый диапазон байт начало:конец")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        tree = build_tree(args.file, args.chunk_size, args.algorithm, args.workers)
+        save_tree(tree, args.tree)
+        print(f"Корень: {tree['root']}")
+        return 0
+
+    tree = load_tree(args.tree)
+    if args.command == "update":
+        tree, dirty = update_tree(args.file, tree, args.ranges, args.workers)
+        save_tree(tree, args.tree)
+        print(f"Перехэшировано кусков: {len(dirty)}")
+        print(f"Корень: {tree['root']}")
+        return 0
+
+    try:
+        corrupted = verify_file(args.file, tree, args.workers, args.expected_root)
+    except ValueError as error:
+        print(f"ОШИБКА дерева: {error}")
+        return 1
+    for start, end in corrupted:
+        print(f"ПОВРЕЖДЕНО байты {start}:{end}")
+    if corrupted:
+        return 1
+    print("Файл цел")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,7 @@
 import numpy as np
+import queue
+import struct
+import threading
 
 # https://docs.cntd.ru/document/1200161707
 SBOX = [252, 238, 221, 17, 207, 110, 49, 22, 251, 196, 250, 218, 35, 197, 4, 77, 233, 119, 240, 219, 147, 46, 153, 186, 23, 54, 241, 187, 20, 205, 95, 193, 249, 24, 101, 90, 226, 92, 239, 33, 129, 28, 60, 66, 139, 1, 142, 79, 5, 132, 2, 174, 227, 106, 143, 160, 6, 11, 237, 152, 127, 212, 211, 31, 235, 52, 44, 81, 234, 200, 72, 171, 242, 42, 104, 162, 253, 58, 206, 204, 181, 112, 14, 86, 8, 12, 118, 18, 191, 114, 19, 71, 156, 183, 93, 135, 21, 161, 150, 41, 16, 123, 154, 199, 243, 145, 120, 111, 157, 158, 178, 177, 50, 117, 25, 61, 255, 53, 138, 126, 109, 84, 198, 128, 195, 189, 13, 87, 223, 245, 36, 169, 62, 168, 67, 201, 215, 121, 214, 246, 124, 34, 185, 3, 224, 15, 236, 222, 122, 148, 176, 188, 220, 232, 40, 80, 78, 51, 10, 74, 167, 151, 96, 115, 30, 0, 98, 68, 26, 184, 56, 130, 100, 159, 38, 65, 173, 69, 70, 146, 39, 94, 85, 47, 140, 163, 165, 125, 105, 213, 149, 59, 7, 88, 179, 64, 134, 172, 29, 247, 48, 55, 107, 228, 136, 217, 231, 137, 225, 27, 131, 73, 76, 63, 248, 254, 141, 83, 170, 144, 202, 216, 133, 97, 32, 113, 103, 164, 45, 43, 9, 91, 203, 155, 37, 208, 190, 229, 108, 82, 89, 166, 116, 210, 230, 244, 180, 192, 209, 102, 175, 194, 57, 75, 99, 182]
@@ -20,6 +23,7 @@ A_MATRIX_HEX = [
     "70a6a56e2440598e", "3853dc371220a247", "1ca76e95091051ad", "0edd37c48a08a6d8",
     "07e095624504536c", "8d70c431ac02a736", "c83862965601dd1b", "641c314b2b8ee083"
 ]   
+A_ROWS = [int(x, 16) for x in A_MATRIX_HEX]
 
 
 # ------ TRANSFORMATIONS GOST 34.11-2018
@@ -51,6 +55,15 @@ def P_transformation(a):
     return int.from_bytes(res, 'big')
 
 
+def l_transformation(word):
+    # умножение 64-битного слова на матрицу A над GF(2): старший бит выбирает строку A[0]
+    result_word = 0
+    for j in range(64):
+        if (word >> (63 - j)) & 1:
+            result_word ^= A_ROWS[j]
+    return result_word
+
+
 def L_transformation(a):
     if isinstance(a, int):
         full = a.to_bytes(64, 'big')
@@ -59,16 +72,11 @@ def L_transformation(a):
     full = full.rjust(64, b'\x00')[:64]
 
     out_words = []
-    A_rows = [int(x, 16) for x in A_MATRIX_HEX]
 
     for block_idx in range(8):
         word_bytes = full[block_idx*8:(block_idx+1)*8]
         word = int.from_bytes(word_bytes, 'big') 
-        result_word = 0
-        for j in range(64):
-            if (word >> (63 - j)) & 1:
-                result_word ^= A_rows[j]
-        out_words.append(result_word.to_bytes(8, 'big'))
+        out_words.append(l_transformation(word).to_bytes(8, 'big'))
 
     result = b''.join(out_words)
     return int.from_bytes(result, 'big')
@@ -88,79 +96,322 @@ C = ["b1085bda1ecadae9ebcb2f81c0657c1f2f6a76432e45d016714eb88d7585c4fc4b7ce09192
      "7bcd9ed0efc889fb3002c6cd635afe94d8fa6bbbebab076120018021148466798a1d71efea48b9caefbacd1d7d476e98dea2594ac06fd85d6bcaa4cd81f32d1b",
      "378ee767f11631bad21380b00449b17acda43c32bcdf1d77f82012d430219f9b5d80ef9d1891cc86e71da4aa88e12852faf417d5d9b21b9948bc924af11bd720"]
 
+
+
+# ------ TABLE-DRIVEN LPS
+# Состояние - 8 слов по 64 бита, слово 0 - младшее. Преобразования S, P и L
+# сводятся к 8 таблицам: LPS_TABLES[r][b] = L(S[b] в байте r слова), поэтому слово j
+# результата - XOR восьми значений LPS_TABLES[r][байт j слова r]
+LPS_TABLES = [[l_transformation(SBOX[b] << (8 * r)) for b in range(256)] for r in range(8)]
+
+
+def int_to_words(a):
+    return list(struct.unpack('<8Q', a.to_bytes(64, 'little')))
+
+
+# Константы раундов разбираются один раз
+C_WORDS = [int_to_words(int(c, 16)) for c in C]
+
+
+def LPS(a):
+    a0, a1, a2, a3, a4, a5, a6, a7 = a
+    T0, T1, T2, T3, T4, T5, T6, T7 = LPS_TABLES
+    result = []
+    for shift in range(0, 64, 8):
+        result.append(T0[(a0 >> shift) & 0xff] ^ T1[(a1 >> shift) & 0xff] ^
+                      T2[(a2 >> shift) & 0xff] ^ T3[(a3 >> shift) & 0xff] ^
+                      T4[(a4 >> shift) & 0xff] ^ T5[(a5 >> shift) & 0xff] ^
+                      T6[(a6 >> shift) & 0xff] ^ T7[(a7 >> shift) & 0xff])
+    return result
+
+
 def key_schedule(key, i):
-    key = key ^ int(C[i], 16)
-    key = S_transformation(key)
-    key = P_transformation(key)
-    key = L_transformation(key)
-    return key
+    c = C_WORDS[i]
+    return LPS([key[j] ^ c[j] for j in range(8)])
 
 
 def e_function(key, m):
-    state = key ^ m
+    state = [key[j] ^ m[j] for j in range(8)]
     for i in range(12):
-        state = S_transformation(state)
-        state = P_transformation(state)
-        state = L_transformation(state)
+        state = LPS(state)
         key = key_schedule(key, i)
-        state = state ^ key
+        state = [state[j] ^ key[j] for j in range(8)]
     return state
 
 
 def g_function(N, m, h):
-    key = h ^ N
-    key = S_transformation(key)
-    key = P_transformation(key)
-    key = L_transformation(key)
+    """
+    g_N(h, m) = E(LPS(h ^ N), m) ^ h ^ m, все аргументы - списки из 8 слов
+    """
+    key = LPS([h[j] ^ N[j] for j in range(8)])
     t = e_function(key, m)
-    t = h ^ t
-    g = t ^ m
-    return g
+    return [t[j] ^ h[j] ^ m[j] for j in range(8)]
 
 
 # ------ hash-func GOST 34.11-2018
+# Байты сообщения читаются как число в порядке little-endian (как в контрольных
+# примерах стандарта и RFC 6986), поэтому сообщение обрабатывается от начала к концу
+MOD512 = 2**512
+
+
+class Streebog512:
+    """
+    Потоковое хэширование в стиле hashlib: update() / digest() / hexdigest() / copy().
+    Хранит только состояние h, счётчики N и Sigma и неполный блок (< 64 байт)
+    """
+    name = "streebog512"
+    digest_size = 64
+    block_size = 64
+    IV = [0x0000000000000000] * 8
+
+    def __init__(self, data=b""):
+        self._h = list(self.IV)
+        self._N = 0
+        self._sigma = 0
+        self._buffer = b""
+        if data:
+            self.update(data)
+
+    def _compress(self, block):
+        m = list(struct.unpack('<8Q', block))
+        self._h = g_function(int_to_words(self._N), m, self._h)
+        self._N = (self._N + 512) % MOD512
+        self._sigma = (self._sigma + int.from_bytes(block, 'little')) % MOD512
+
+    def update(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        data = memoryview(data).cast('B')
+        offset = 0
+        if self._buffer:
+            offset = 64 - len(self._buffer)
+            self._buffer += bytes(data[:offset])
+            if len(self._buffer) < 64:
+                return
+            self._compress(self._buffer)
+            self._buffer = b""
+        end = len(data) - (len(data) - offset) % 64
+        for pos in range(offset, end, 64):
+            self._compress(data[pos:pos + 64])
+        self._buffer = bytes(data[end:])
+
+    def copy(self):
+        other = self.__class__.__new__(self.__class__)
+        other._h = list(self._h)
+        other._N = self._N
+        other._sigma = self._sigma
+        other._buffer = self._buffer
+        return other
+
+    def _final_state(self):
+        # дополнение 0...01||M: единичный бит сразу после последнего байта сообщения
+        padded = self._buffer + b'\x01' + bytes(63 - len(self._buffer))
+        m = list(struct.unpack('<8Q', padded))
+        h = g_function(int_to_words(self._N), m, self._h)
+        N = (self._N + len(self._buffer) * 8) % MOD512
+        sigma = (self._sigma + int.from_bytes(padded, 'little')) % MOD512
+        zero = [0] * 8
+        h = g_function(zero, int_to_words(N), h)
+        h = g_function(zero, int_to_words(sigma), h)
+        return h
+
+    def digest(self):
+        return struct.pack('<8Q', *self._final_state())
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+class Streebog256(Streebog512):
+    """
+    Тот же алгоритм с IV = 0x01...01; результат - старшие 256 бит
+    """
+    name = "streebog256"
+    digest_size = 32
+    IV = [0x0101010101010101] * 8
+
+    def digest(self):
+        return struct.pack('<4Q', *self._final_state()[4:])
+
+
 def hash_gost(m, output=512):
+    """
+    Хэш как число (младший байт сообщения - младший байт числа)
+    """
     if output == 512:
-        h = bytes([0x00] * 64)
+        hasher = Streebog512()
     elif output == 256:
-        h = bytes([0x01] * 64)
-    h = int.from_bytes(h, 'big')
-    
-    N = 0x00  
-    E = 0x00  
-    
-    if isinstance(m, str):
-        m = bytearray(m.encode('utf-8'))
-    elif isinstance(m, int):
-        m = bytearray(m.to_bytes(64, 'big'))
-    
-    message_bits = len(m) * 8
-    while message_bits >= 512:
-        m_block = m[-64:] 
-        m_int = int.from_bytes(m_block, 'big')
-        h = g_function(N, m_int, h)
-        N = (N + 512) % (2**512)
-        E = (E + m_int) % (2**512)
-        m = m[:-64]
-        message_bits = len(m) * 8
-    
-    m_with_padding = bytearray(64)
-    if len(m) > 0:
-        m_with_padding[-len(m):] = m
-    one_byte_pos = 64 - len(m) - 1
-    m_with_padding[one_byte_pos] = 0x80
-    m_int = int.from_bytes(m_with_padding, 'big')
+        hasher = Streebog256()
+    else:
+        raise ValueError("Длина хэша должна быть 256 или 512 бит")
     
-    h = g_function(N, m_int, h)
-    N = (N + len(m)*8) % (2**512)
-    E = (E + m_int) % (2**512)
-    h = g_function(0, h, N)
-    h = g_function(0, h, E)
-
-    if output == 256:
-        h >>= 256
-
-    return h
+    if isinstance(m, int):
+        m = m.to_bytes(64, 'little')
+    hasher.update(m)
+
+    return int.from_bytes(hasher.digest(), 'little')
+
+
+# ------ HMAC / PBKDF2 (Р 50.1.113-2016, Р 50.1.111-2016)
+class HMAC:
+    """
+    HMAC на Стрибоге. Состояния хэша после блоков K ^ ipad и K ^ opad считаются
+    один раз при создании и дальше только копируются
+    """
+    def __init__(self, key, msg=b"", digestmod=Streebog512):
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        block_size = digestmod.block_size
+        if len(key) > block_size:
+            key = digestmod(key).digest()
+        key = key.ljust(block_size, b'\x00')
+
+        self.digestmod = digestmod
+        self.digest_size = digestmod.digest_size
+        self._inner = digestmod(bytes(b ^ 0x36 for b in key))
+        self._outer = digestmod(bytes(b ^ 0x5c for b in key))
+        if msg:
+            self.update(msg)
+
+    def update(self, msg):
+        self._inner.update(msg)
+
+    def copy(self):
+        other = self.__class__.__new__(self.__class__)
+        other.digestmod = self.digestmod
+        other.digest_size = self.digest_size
+        other._inner = self._inner.copy()
+        other._outer = self._outer
+        return other
+
+    def digest(self):
+        outer = self._outer.copy()
+        outer.update(self._inner.digest())
+        return outer.digest()
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def pbkdf2_streebog(password, salt, iterations, dklen=64, digestmod=Streebog512):
+    """
+    PBKDF2 с HMAC на Стрибоге: ключ обрабатывается один раз,
+    каждая итерация - копия готового HMAC-состояния и два сжатия
+    """
+    if isinstance(salt, str):
+        salt = salt.encode('utf-8')
+    prf = HMAC(password, digestmod=digestmod)
+    size = prf.digest_size
+
+    result = b""
+    for i in range(1, -(-dklen // size) + 1):
+        u = prf.copy()
+        u.update(salt + i.to_bytes(4, 'big'))
+        U = u.digest()
+        T = int.from_bytes(U, 'big')
+        for _ in range(iterations - 1):
+            u = prf.copy()
+            u.update(U)
+            U = u.digest()
+            T ^= int.from_bytes(U, 'big')
+        result += T.to_bytes(size, 'big')
+    return result[:dklen]
+
+
+# ------ BATCH hash GOST 34.11-2018 (NumPy)
+# Состояния многих сообщений хранятся в массиве (count x 8) uint64,
+# одно LPS - выборка из таблиц сразу для всех сообщений
+LPS_TABLES_NP = np.array(LPS_TABLES, dtype=np.uint64)
+C_WORDS_NP = np.array(C_WORDS, dtype=np.uint64)
+_WORD_INDEX = np.arange(8)[None, :, None]
+
+
+def LPS_batch(a):
+    # байт j слова r каждого состояния (слова little-endian)
+    b = np.ascontiguousarray(a, dtype='<u8').view(np.uint8).reshape(-1, 8, 8)
+    return np.bitwise_xor.reduce(LPS_TABLES_NP[_WORD_INDEX, b], axis=1)
+
+
+def g_function_batch(N, m, h):
+    key = LPS_batch(h ^ N)
+    state = key ^ m
+    for i in range(12):
+        key = LPS_batch(key ^ C_WORDS_NP[i])
+        state = LPS_batch(state) ^ key
+    return state ^ h ^ m
+
+
+def add512_batch(a, b):
+    """
+    Сложение 512-битных чисел по модулю 2^512 (массивы count x 8 слов)
+    """
+    result = np.empty_like(a)
+    carry = np.zeros(len(a), dtype=np.uint64)
+    for i in range(8):
+        s = a[:, i] + b[:, i]
+        c1 = s < a[:, i]
+        s2 = s + carry
+        c2 = s2 < s
+        result[:, i] = s2
+        carry = (c1 | c2).astype(np.uint64)
+    return result
+
+
+def streebog_batch(messages, output=512):
+    """
+    Хэши многих сообщений за один вызов: сообщения группируются по числу
+    полных блоков, и каждая группа сжимается одним векторным проходом.
+    Возвращает список digest() в том же порядке, что и Streebog512/Streebog256
+    """
+    if output not in (256, 512):
+        raise ValueError("Длина хэша должна быть 256 или 512 бит")
+    messages = [m.encode('utf-8') if isinstance(m, str) else bytes(m) for m in messages]
+    iv = np.uint64(0x0101010101010101 if output == 256 else 0)
+
+    groups = {}
+    for idx, m in enumerate(messages):
+        groups.setdefault(len(m) // 64, []).append(idx)
+
+    digests = [None] * len(messages)
+    for num_blocks, indices in groups.items():
+        count = len(indices)
+        h = np.full((count, 8), iv, dtype=np.uint64)
+        # длина в битах помещается в младшее слово N для сообщений короче 2^61 байт
+        N = np.zeros((count, 8), dtype=np.uint64)
+        sigma = np.zeros((count, 8), dtype=np.uint64)
+
+        if num_blocks:
+            full = b"".join(messages[i][:num_blocks * 64] for i in indices)
+            blocks = np.frombuffer(full, dtype='<u8').reshape(count, num_blocks, 8).astype(np.uint64)
+            for j in range(num_blocks):
+                m = np.ascontiguousarray(blocks[:, j])
+                h = g_function_batch(N, m, h)
+                N[:, 0] += np.uint64(512)
+                sigma = add512_batch(sigma, m)
+
+        # дополнение 0...01||M для остатка каждого сообщения
+        padded = bytearray(64 * count)
+        tail_bits = np.zeros(count, dtype=np.uint64)
+        for row, i in enumerate(indices):
+            tail = messages[i][num_blocks * 64:]
+            padded[row * 64:row * 64 + len(tail)] = tail
+            padded[row * 64 + len(tail)] = 0x01
+            tail_bits[row] = len(tail) * 8
+        m = np.frombuffer(bytes(padded), dtype='<u8').reshape(count, 8).astype(np.uint64)
+
+        h = g_function_batch(N, m, h)
+        N[:, 0] += tail_bits
+        sigma = add512_batch(sigma, m)
+        zero = np.zeros((count, 8), dtype=np.uint64)
+        h = g_function_batch(zero, N, h)
+        h = g_function_batch(zero, sigma, h)
+
+        out = h.astype('<u8')
+        if output == 256:
+            out = out[:, 4:]
+        for row, i in enumerate(indices):
+            digests[i] = out[row].tobytes()
+    return digests
 
 
 # ------ TRANSFORMATIONS SHA-1
@@ -170,62 +421,198 @@ def rotate_left(n, b):
     return ((n << b) | (n >> (32 - b))) & 0xffffffff
 
 
+def sha1_compress(h, block):
+    """
+    Обработка одного 64-байтового блока; 80 раундов разбиты на 4 этапа по 20
+    со своей функцией f и константой K
+    """
+    w = [0] * 80
+    w[:16] = struct.unpack('>16I', block)
+    for t in range(16, 80):
+        x = w[t-3] ^ w[t-8] ^ w[t-14] ^ w[t-16]
+        w[t] = ((x << 1) | (x >> 31)) & 0xffffffff
+
+    a, b, c, d, e = h
+
+    for t in range(0, 20):
+        temp = (((a << 5) | (a >> 27)) + ((b & c) | (~b & d)) + e + w[t] + 0x5A827999) & 0xffffffff
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xffffffff, a, temp
+
+    for t in range(20, 40):
+        temp = (((a << 5) | (a >> 27)) + (b ^ c ^ d) + e + w[t] + 0x6ED9EBA1) & 0xffffffff
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xffffffff, a, temp
+
+    for t in range(40, 60):
+        temp = (((a << 5) | (a >> 27)) + ((b & c) | (b & d) | (c & d)) + e + w[t] + 0x8F1BBCDC) & 0xffffffff
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xffffffff, a, temp
+
+    for t in range(60, 80):
+        temp = (((a << 5) | (a >> 27)) + (b ^ c ^ d) + e + w[t] + 0xCA62C1D6) & 0xffffffff
+        e, d, c, b, a = d, c, ((b << 30) | (b >> 2)) & 0xffffffff, a, temp
+
+    return [(h[0] + a) & 0xffffffff, (h[1] + b) & 0xffffffff, (h[2] + c) & 0xffffffff,
+            (h[3] + d) & 0xffffffff, (h[4] + e) & 0xffffffff]
+
+
+class SHA1:
+    """
+    Потоковый SHA-1 в стиле hashlib: update() / digest() / hexdigest() / copy()
+    """
+    name = "sha1"
+    digest_size = 20
+    block_size = 64
+    IV = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+
+    def __init__(self, data=b""):
+        self._h = list(self.IV)
+        self._length = 0
+        self._buffer = b""
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        data = memoryview(data).cast('B')
+        self._length += len(data)
+        offset = 0
+        if self._buffer:
+            offset = 64 - len(self._buffer)
+            self._buffer += bytes(data[:offset])
+            if len(self._buffer) < 64:
+                return
+            self._h = sha1_compress(self._h, self._buffer)
+            self._buffer = b""
+        end = len(data) - (len(data) - offset) % 64
+        h = self._h
+        for pos in range(offset, end, 64):
+            h = sha1_compress(h, data[pos:pos + 64])
+        self._h = h
+        self._buffer = bytes(data[end:])
+
+    def copy(self):
+        other = self.__class__.__new__(self.__class__)
+        other._h = list(self._h)
+        other._length = self._length
+        other._buffer = self._buffer
+        return other
+
+    def digest(self):
+        # дополнение: бит 1, нули до 56 байт по модулю 64 и длина в битах
+        tail = (self._buffer + b'\x80' + bytes((55 - len(self._buffer)) % 64) +
+                (self._length * 8).to_bytes(8, 'big'))
+        h = self._h
+        for pos in range(0, len(tail), 64):
+            h = sha1_compress(h, tail[pos:pos + 64])
+        return struct.pack('>5I', *h)
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
 def sha1(message):
-    if isinstance(message, str):
-        message = message.encode('utf-8')
-    
-    msg_len = len(message)
-    message += b'\x80'
-    
-    while (len(message) % 64) != 56:
-        message += b'\x00'
-    
-    message += (msg_len * 8).to_bytes(8, 'big')
-    
-    h0 = 0x67452301
-    h1 = 0xEFCDAB89
-    h2 = 0x98BADCFE
-    h3 = 0x10325476
-    h4 = 0xC3D2E1F0
-    
-    for i in range(0, len(message), 64):
-        block = message[i:i+64]
-        
-        w = [int.from_bytes(block[i*4:(i+1)*4], 'big') for i in range(16)]
-        
-        for t in range(16, 80):
-            w.append(rotate_left(w[t-3] ^ w[t-8] ^ w[t-14] ^ w[t-16], 1))
-        
-        a, b, c, d, e = h0, h1, h2, h3, h4
-        
-        for t in range(80):
-            if 0 <= t <= 19:
-                K = 0x5A827999
-                f = (b & c) | ((~b) & d)
-            elif 20 <= t <= 39:
-                K = 0x6ED9EBA1
-                f = b ^ c ^ d
-            elif 40 <= t <= 59:
-                K = 0x8F1BBCDC
-                f = (b & c) | (b & d) | (c & d)
-            else:
-                K = 0xCA62C1D6
-                f = b ^ c ^ d
-            
-            temp = (rotate_left(a, 5) + f + e + w[t] + K) & 0xffffffff
-            e = d
-            d = c
-            c = rotate_left(b, 30)
-            b = a
-            a = temp
-        
-        h0 = (h0 + a) & 0xffffffff
-        h1 = (h1 + b) & 0xffffffff
-        h2 = (h2 + c) & 0xffffffff
-        h3 = (h3 + d) & 0xffffffff
-        h4 = (h4 + e) & 0xffffffff
-    
-    return hex((h0 << 128) | (h1 << 96) | (h2 << 64) | (h3 << 32) | h4)
+    return hex(int.from_bytes(SHA1(message).digest(), 'big'))
+
+
+# ------ Несколько хэшей за одно чтение
+HASHERS = {cls.name: cls for cls in (Streebog512, Streebog256, SHA1)}
+
+# Размер куска при чтении файла
+READ_CHUNK = 1 << 20
+
+
+class MultiHasher:
+    """
+    Один поток данных подаётся сразу в несколько хэшей. При threads=True у каждого
+    хэша свой поток с очередью кусков: пока хэши считают, основной поток читает
+    следующий кусок (чтение файла отпускает GIL). Исключение из потока хэша
+    пробрасывается следующим вызовом update() или digests()
+    """
+    def __init__(self, algorithms=("streebog512", "streebog256", "sha1"), threads=False, max_pending=4):
+        unknown = [name for name in algorithms if name not in HASHERS]
+        if unknown:
+            raise ValueError(f"Неизвестные алгоритмы: {', '.join(unknown)}")
+        self.hashers = {name: HASHERS[name]() for name in algorithms}
+        self._queues = []
+        self._threads = []
+        self._errors = []
+        self._finished = False
+        if threads:
+            for hasher in self.hashers.values():
+                q = queue.Queue(max_pending)
+                thread = threading.Thread(target=self._worker, args=(hasher, q, self._errors), daemon=True)
+                thread.start()
+                self._queues.append(q)
+                self._threads.append(thread)
+
+    @staticmethod
+    def _worker(hasher, q, errors):
+        failed = False
+        while True:
+            data = q.get()
+            if data is None:
+                return
+            # после ошибки очередь всё равно разбирается, иначе q.put() в update() заблокируется
+            if failed:
+                continue
+            try:
+                hasher.update(data)
+            except Exception as error:
+                errors.append(error)
+                failed = True
+
+    def _raise_error(self):
+        if self._errors:
+            raise self._errors[0]
+
+    def update(self, data):
+        if self._finished:
+            raise ValueError("update() после digests() недоступен")
+        self._raise_error()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self._queues:
+            # кусок разделяется между потоками, поэтому не должен меняться после передачи
+            data = bytes(data)
+            for q in self._queues:
+                q.put(data)
+        else:
+            for hasher in self.hashers.values():
+                hasher.update(data)
+
+    def _finish(self):
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._queues = []
+        self._threads = []
+        self._finished = True
+
+    def digests(self):
+        """
+        Словарь {алгоритм: хэш в байтах}; после вызова update() недоступен
+        """
+        self._finish()
+        self._raise_error()
+        return {name: hasher.digest() for name, hasher in self.hashers.items()}
+
+    def hexdigests(self):
+        return {name: digest.hex() for name, digest in self.digests().items()}
+
+
+def hash_file_multi(path, algorithms=("streebog512", "streebog256", "sha1"), threads=False, chunk_size=READ_CHUNK):
+    """
+    Все хэши файла за один проход по нему
+    """
+    hasher = MultiHasher(algorithms, threads)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.digests()
 
 
 def verify_file_integrity(actual_hash, expected_hash):
@@ -236,9 +623,12 @@ def verify_file_integrity(actual_hash, expected_hash):
 if __name__ == "__main__":
     test_file_content = ""
     
-    gost512_hash = hash_gost(test_file_content, 512)
-    gost256_hash = hash_gost(test_file_content, 256)
-    sha1_hash = sha1(test_file_content)
+    multi = MultiHasher()
+    multi.update(test_file_content)
+    digests = multi.digests()
+    gost512_hash = int.from_bytes(digests["streebog512"], 'little')
+    gost256_hash = int.from_bytes(digests["streebog256"], 'little')
+    sha1_hash = hex(int.from_bytes(digests["sha1"], 'big'))
     
     print(f"Исходное сообщение: {test_file_content}")
     print(f"ГОСТ 512: {gost512_hash}")
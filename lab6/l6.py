@@ -1,6 +1,12 @@
+import builtins
+import multiprocessing
+import os
 import secrets
-from typing import Tuple
-from l5 import hash_gost
+import struct
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from field import batch_inverse, batch_to_affine, mod_inverse, mod_sqrt
+from l5 import hash_gost, streebog_batch
 
 def hash(data: bytes, digest_size: int = 256):
     if digest_size == 256:
@@ -9,24 +15,6 @@ def hash(data: bytes, digest_size: int = 256):
         return hash_gost(data, 512)
 
 
-def mod_inverse(a: int, m: int) -> int:
-    if a < 0:
-        a = (a % m + m) % m
-    g, x, _ = extended_gcd(a, m)
-    if g != 1:
-        raise Exception("Обратного элемента не существует")
-    return x % m
-
-
-def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-    if a == 0:
-        return b, 0, 1
-    gcd, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return gcd, x, y
-
-
 def point_add(x1: int, y1: int, x2: int, y2: int):
     if x1 == x2 and y1 == y2:
         lambda_val = (3 * x1 * x1 + a) * mod_inverse(2 * y1, p) % p
@@ -38,21 +26,598 @@ def point_add(x1: int, y1: int, x2: int, y2: int):
     return x3, y3
 
 
-def point_multiply(k: int, x: int, y: int):
-    result_x, result_y = None, None
-    buf_x, buf_y = x, y
-    
-    while k:
-        if k & 1: 
-            if result_x is None:
-                result_x, result_y = buf_x, buf_y
-            else:
-                result_x, result_y = point_add(result_x, result_y, buf_x, buf_y)
-        
-        buf_x, buf_y = point_add(buf_x, buf_y, buf_x, buf_y)
+# ------ Якобиановы координаты: точка (X, Y, Z) соответствует (X/Z^2, Y/Z^3),
+# Z = 0 - бесконечно удалённая точка. Сложение и удвоение без обращений,
+# в аффинные координаты точка переводится один раз в конце
+INFINITY = (1, 1, 0)
+
+
+def to_jacobian(x: int, y: int):
+    if x is None:
+        return INFINITY
+    return x, y, 1
+
+
+def to_affine(P):
+    X, Y, Z = P
+    if Z == 0:
+        return None, None
+    z_inv = mod_inverse(Z, p)
+    z_inv2 = z_inv * z_inv % p
+    return X * z_inv2 % p, Y * z_inv2 * z_inv % p
+
+
+def jacobian_double(P):
+    X, Y, Z = P
+    if Z == 0 or Y == 0:
+        return INFINITY
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    ZZ = Z * Z % p
+    M = (3 * X * X + a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y * Z % p
+    return X3, Y3, Z3
+
+
+def jacobian_add(P, Q):
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    if U1 == U2:
+        if S1 != S2:
+            return INFINITY
+        return jacobian_double(P)
+    H = (U2 - U1) % p
+    R = (S2 - S1) % p
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - S1 * HHH) % p
+    Z3 = H * Z1 * Z2 % p
+    return X3, Y3, Z3
+
+
+def jacobian_add_affine(P, x2: int, y2: int):
+    """
+    Смешанное сложение: вторая точка аффинная (Z2 = 1), поэтому меньше умножений
+    """
+    X1, Y1, Z1 = P
+    if Z1 == 0:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % p
+    U2 = x2 * Z1Z1 % p
+    S2 = y2 * Z1 * Z1Z1 % p
+    if X1 == U2:
+        if Y1 != S2:
+            return INFINITY
+        return jacobian_double(P)
+    H = (U2 - X1) % p
+    R = (S2 - Y1) % p
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - Y1 * HHH) % p
+    Z3 = H * Z1 % p
+    return X3, Y3, Z3
+
+
+# wNAF: цифры скаляра нечётны и по модулю меньше 2^(w-1), между ненулевыми цифрами
+# не меньше w-1 нулей, поэтому сложений около n/(w+1). Отрицательная цифра - сложение
+# с -P = (x, -y), так что в таблице нужны только нечётные кратные P, 3P, ..., (2^(w-1)-1)P
+WNAF_WIDTH = 5
+
+
+def wnaf(k: int, width: int = WNAF_WIDTH):
+    """
+    Цифры width-NAF скаляра k > 0, начиная с младшей
+    """
+    digits = []
+    while k > 0:
+        if k & 1:
+            digit = k & ((1 << width) - 1)
+            if digit >= 1 << (width - 1):
+                digit -= 1 << width
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
         k >>= 1
-    
-    return result_x, result_y
+    return digits
+
+
+def odd_multiples(x: int, y: int, width: int = WNAF_WIDTH):
+    """
+    [P, 3P, ..., (2^(w-1)-1)P] в аффинных координатах (два обращения на таблицу)
+    """
+    twice_x, twice_y = to_affine(jacobian_double(to_jacobian(x, y)))
+    points = []
+    point = to_jacobian(x, y)
+    for _ in range((1 << (width - 2)) - 1):
+        point = jacobian_add_affine(point, twice_x, twice_y)
+        points.append(point)
+    return [(x, y)] + batch_to_affine(points, p)
+
+
+def point_multiply(k: int, x: int, y: int, affine: bool = True, width: int = WNAF_WIDTH):
+    """
+    k * (x, y) по wNAF в якобиановых координатах; при affine=False результат не нормализуется,
+    чтобы многие точки можно было перевести в аффинные одним обращением
+    """
+    result = INFINITY
+    if k > 0:
+        table = odd_multiples(x, y, width=width)
+        for digit in reversed(wnaf(k, width)):
+            result = jacobian_double(result)
+            if digit > 0:
+                mx, my = table[digit >> 1]
+                result = jacobian_add_affine(result, mx, my)
+            elif digit < 0:
+                mx, my = table[-digit >> 1]
+                result = jacobian_add_affine(result, mx, -my % p)
+    return to_affine(result) if affine else result
+
+
+# ------ Таблица для умножения на образующую точку (фиксированное окно)
+# Строка i таблицы содержит j * 2^(w*i) * P для j = 1..2^w-1 в аффинных координатах,
+# поэтому k * P - сумма не более 256/w точек без удвоений
+FIXED_BASE_WINDOW = 6
+TABLE_MAGIC = b"ECFB"
+TABLE_HEADER = struct.Struct(">4sBH")
+
+_generator_table = None
+
+
+def build_fixed_base_table(x: int, y: int, window: int = FIXED_BASE_WINDOW):
+    rows = -(-q.bit_length() // window)
+    size = (1 << window) - 1
+    points = []
+    base = to_jacobian(x, y)
+    for _ in range(rows):
+        point = INFINITY
+        for _ in range(size):
+            point = jacobian_add(point, base)
+            points.append(point)
+        base = jacobian_add(point, base)
+    # все точки таблицы переводятся в аффинные координаты одним обращением
+    affine = batch_to_affine(points, p)
+    return [[None] + affine[i * size:(i + 1) * size] for i in range(rows)]
+
+
+def fixed_base_multiply(k: int, table, window: int = FIXED_BASE_WINDOW, affine: bool = True):
+    k %= q
+    mask = (1 << window) - 1
+    result = INFINITY
+    for row in table:
+        digit = k & mask
+        if digit:
+            result = jacobian_add_affine(result, *row[digit])
+        k >>= window
+    return to_affine(result) if affine else result
+
+
+def save_fixed_base_table(path: str, table, x: int, y: int, window: int = FIXED_BASE_WINDOW):
+    with open(path, 'wb') as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, window, len(table)))
+        f.write(x.to_bytes(32, 'big') + y.to_bytes(32, 'big'))
+        for row in table:
+            for px, py in row[1:]:
+                f.write(px.to_bytes(32, 'big') + py.to_bytes(32, 'big'))
+
+
+def load_fixed_base_table(path: str, x: int, y: int, window: int = FIXED_BASE_WINDOW):
+    """
+    Таблица из файла проверяется перед использованием так же, как строилась: строка -
+    кратные B, 2B, ..., (2^w - 1)B своей базы B, база следующей строки - 2^w * B,
+    первая база - (x, y). Это одно смешанное сложение на точку без обращений,
+    а повреждённый файл иначе давал бы неверные подписи
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, file_window, rows = TABLE_HEADER.unpack_from(data)
+    offset = TABLE_HEADER.size
+    base = (int.from_bytes(data[offset:offset + 32], 'big'), int.from_bytes(data[offset + 32:offset + 64], 'big'))
+    if magic != TABLE_MAGIC or file_window != window or base != (x, y):
+        raise ValueError("Таблица построена для другой точки или другого окна")
+    if len(data) != offset + 64 + rows * ((1 << window) - 1) * 64:
+        raise ValueError("Файл таблицы повреждён")
+    offset += 64
+    table = []
+    for _ in range(rows):
+        row = [None]
+        for _ in range(1, 1 << window):
+            row.append((int.from_bytes(data[offset:offset + 32], 'big'),
+                        int.from_bytes(data[offset + 32:offset + 64], 'big')))
+            offset += 64
+        table.append(row)
+
+    expected = to_jacobian(x, y)
+    for row in table:
+        base = row[1]
+        for px, py in row[1:]:
+            if not jacobian_equal(expected, to_jacobian(px, py)):
+                raise ValueError("Файл таблицы повреждён: точки не соответствуют образующей")
+            expected = jacobian_add_affine(to_jacobian(px, py), *base)
+    return table
+
+
+def generator_table(path: str = None):
+    """
+    Таблица для образующей (xp, yp): строится один раз на процесс при первом обращении.
+    Если указан path, таблица читается из файла, а при его отсутствии сохраняется туда
+    """
+    global _generator_table
+    if _generator_table is None:
+        if path and os.path.exists(path):
+            _generator_table = load_fixed_base_table(path, xp, yp)
+        else:
+            _generator_table = build_fixed_base_table(xp, yp)
+            if path:
+                save_fixed_base_table(path, _generator_table, xp, yp)
+    return _generator_table
+
+
+def generator_multiply(k: int, affine: bool = True):
+    """
+    k * (xp, yp) по таблице образующей
+    """
+    return fixed_base_multiply(k, generator_table(), affine=affine)
+
+
+# ------ Одновременное умножение k1 * P1 + k2 * P2 (трюк Шамира с окнами):
+# общая цепочка удвоений, на каждое окно - по одному сложению с кратным каждой точки
+SHAMIR_WINDOW = 4
+MULTIPLES_CACHE_SIZE = 128
+
+_multiples_cache = OrderedDict()
+
+
+def point_multiples(x: int, y: int, window: int = SHAMIR_WINDOW):
+    """
+    [None, P, 2P, ..., (2^w-1)P] в аффинных координатах. Кратные последних
+    MULTIPLES_CACHE_SIZE точек (например, открытых ключей) хранятся в кэше
+    """
+    key = (x, y, window)
+    multiples = _multiples_cache.get(key)
+    if multiples is not None:
+        _multiples_cache.move_to_end(key)
+        return multiples
+    points = []
+    point = INFINITY
+    for _ in range(1, 1 << window):
+        point = jacobian_add_affine(point, x, y)
+        points.append(point)
+    multiples = [None] + batch_to_affine(points, p)
+    _multiples_cache[key] = multiples
+    if len(_multiples_cache) > MULTIPLES_CACHE_SIZE:
+        _multiples_cache.popitem(last=False)
+    return multiples
+
+
+def shamir_multiply(k1: int, x1: int, y1: int, k2: int, x2: int, y2: int, window: int = SHAMIR_WINDOW,
+                    affine: bool = True, multiples2=None):
+    """
+    k1 * (x1, y1) + k2 * (x2, y2) с одной цепочкой удвоений.
+    multiples2 - готовые кратные второй точки (например, сохранённые в PublicKey)
+    """
+    k1 %= q
+    k2 %= q
+    table1 = point_multiples(x1, y1, window)
+    table2 = multiples2 or point_multiples(x2, y2, window)
+    mask = (1 << window) - 1
+    rows = -(-max(k1.bit_length(), k2.bit_length()) // window)
+    result = INFINITY
+    for i in reversed(range(rows)):
+        for _ in range(window):
+            result = jacobian_double(result)
+        shift = i * window
+        digit1 = (k1 >> shift) & mask
+        digit2 = (k2 >> shift) & mask
+        if digit1:
+            result = jacobian_add_affine(result, *table1[digit1])
+        if digit2:
+            result = jacobian_add_affine(result, *table2[digit2])
+    return to_affine(result) if affine else result
+
+
+# ------ Проверка подписей
+# Пакетная проверка с fast=True сначала проверяет случайную линейную комбинацию
+# BATCH_CHUNK подписей: сумма c_i * C_i считается одним умножением на образующую и
+# одним на каждый ключ. Подпись хранит только r = x(C), поэтому знак каждой точки
+# R_i = (r_i, y_i) неизвестен и перебирается (2^(n-1) вариантов сумм)
+BATCH_CHUNK = 8
+BATCH_COEFFICIENT_BITS = 64
+
+
+def hash_batch(messages, digest_size: int = 256):
+    """
+    hash() для многих сообщений одним векторным проходом
+    """
+    return [int.from_bytes(digest, 'little') for digest in streebog_batch(messages, digest_size)]
+
+
+def jacobian_negate(P):
+    X, Y, Z = P
+    return X, -Y % p, Z
+
+
+def jacobian_equal(P, Q, up_to_sign: bool = False):
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0 or Z2 == 0:
+        return Z1 == Z2
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    if X1 * Z2Z2 % p != X2 * Z1Z1 % p:
+        return False
+    y1 = Y1 * Z2 * Z2Z2 % p
+    y2 = Y2 * Z1 * Z1Z1 % p
+    return y1 == y2 or (up_to_sign and y1 == -y2 % p)
+
+
+def _parse_signature(signature: bytes):
+    """
+    (r, s) из подписи; None, если подпись некорректна
+    """
+    if len(signature) != 64:
+        return None
+    r = int.from_bytes(signature[:32], 'big')
+    s = int.from_bytes(signature[32:], 'big')
+    if not (0 < r < q and 0 < s < q):
+        return None
+    return r, s
+
+
+def _message_scalar(alpha: int):
+    e = alpha % q
+    return e if e else 1
+
+
+def _verification_scalars(alpha: int, signature: bytes):
+    """
+    (r, z1, z2) для проверки C = z1 * P + z2 * Q; None, если подпись некорректна
+    """
+    parsed = _parse_signature(signature)
+    if parsed is None:
+        return None
+    r, s = parsed
+    v = mod_inverse(_message_scalar(alpha), q)
+    return r, s * v % q, -r * v % q
+
+
+def _check_single(r: int, z1: int, z2: int, xq: int, yq: int, multiples=None):
+    # x(C) = X / Z^2 сравнивается с r без обращения; x(C) < p < q, поэтому x(C) mod q = x(C)
+    X, _, Z = shamir_multiply(z1, xp, yp, z2, xq, yq, affine=False, multiples2=multiples)
+    return Z != 0 and X == r * Z * Z % p
+
+
+def _check_combination(chunk):
+    """
+    Проверка sum c_i * (z1_i * P + z2_i * Q_i) = sum (+-c_i) * R_i со случайными c_i
+    """
+    generator_scalar = 0
+    key_scalars = {}
+    points = []
+    for r, z1, z2, key in chunk:
+        if r >= p:
+            return False
+        y = mod_sqrt(r * r * r + a * r + b, p)
+        if y is None:
+            return False
+        c = secrets.randbits(BATCH_COEFFICIENT_BITS) | 1
+        generator_scalar += c * z1
+        key_scalars[key] = key_scalars.get(key, 0) + c * z2
+        points.append(point_multiply(c, r, y, affine=False))
+
+    keys = list(key_scalars)
+    first_x, first_y = keys[0]
+    total = shamir_multiply(generator_scalar, xp, yp, key_scalars[keys[0]], first_x, first_y, affine=False)
+    for key in keys[1:]:
+        total = jacobian_add(total, point_multiply(key_scalars[key] % q, *key, affine=False))
+
+    # знак первой точки фиксирован, общий знак учитывается сравнением с точностью до знака;
+    # варианты знаков перебираются кодом Грея - одно сложение с +-2R_j на вариант
+    combination = points[0]
+    for point in points[1:]:
+        combination = jacobian_add(combination, point)
+    doubled = [jacobian_double(point) for point in points[1:]]
+    negative = [False] * len(doubled)
+    for step in range(1 << len(doubled)):
+        if step:
+            j = (step & -step).bit_length() - 1
+            negative[j] = not negative[j]
+            delta = jacobian_negate(doubled[j]) if negative[j] else doubled[j]
+            combination = jacobian_add(combination, delta)
+        if jacobian_equal(total, combination, up_to_sign=True):
+            return True
+    return False
+
+
+def verify(msg: bytes, signature: bytes, xq: int, yq: int):
+    scalars = _verification_scalars(hash(msg, 256), signature)
+    return scalars is not None and _check_single(*scalars, xq, yq)
+
+
+class PublicKey:
+    """
+    Открытый ключ (xq, yq). Кратные точки для проверки считаются при первой проверке
+    и хранятся в объекте
+    """
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+        self._multiples = None
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __eq__(self, other):
+        return isinstance(other, PublicKey) and (self.x, self.y) == (other.x, other.y)
+
+    def __hash__(self):
+        # hash() этого модуля - хэш ГОСТ 34.11, здесь нужен встроенный
+        return builtins.hash((self.x, self.y))
+
+    @property
+    def multiples(self):
+        if self._multiples is None:
+            self._multiples = point_multiples(self.x, self.y)
+        return self._multiples
+
+    def verify(self, msg: bytes, signature: bytes):
+        scalars = _verification_scalars(hash(msg, 256), signature)
+        return scalars is not None and _check_single(*scalars, self.x, self.y, self.multiples)
+
+
+class PrivateKey:
+    """
+    Закрытый ключ d. Открытый ключ d * P вычисляется при первом обращении
+    """
+    def __init__(self, d: int):
+        if not 0 < d < q:
+            raise ValueError("Закрытый ключ должен лежать в интервале (0, q)")
+        self.d = d
+        self._public_key = None
+
+    @classmethod
+    def generate(cls):
+        return cls(secrets.randbelow(q - 1) + 1)
+
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = PublicKey(*generator_multiply(self.d))
+        return self._public_key
+
+    def sign(self, msg: bytes):
+        e = _message_scalar(hash(msg, 256))
+        r = s = 0
+        while r == 0 or s == 0:
+            k = secrets.randbelow(q - 1) + 1
+            xc, _ = generator_multiply(k)
+            r = xc % q
+            s = (r * self.d + k * e) % q
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+
+    def sign_batch(self, messages):
+        """
+        Подписи многих сообщений: хэши считаются одним вызовом, точки k * P
+        переводятся в аффинные координаты одним обращением
+        """
+        messages = list(messages)
+        scalars = [_message_scalar(alpha) for alpha in hash_batch(messages)]
+        nonces = [secrets.randbelow(q - 1) + 1 for _ in messages]
+        points = batch_to_affine((generator_multiply(k, affine=False) for k in nonces), p)
+        signatures = []
+        for msg, e, k, (xc, _) in zip(messages, scalars, nonces, points):
+            r = xc % q
+            s = (r * self.d + k * e) % q
+            if r == 0 or s == 0:
+                signatures.append(self.sign(msg))
+            else:
+                signatures.append(r.to_bytes(32, 'big') + s.to_bytes(32, 'big'))
+        return signatures
+
+
+def verify_batch(items, fast: bool = False):
+    """
+    Проверка списка (сообщение, подпись, PublicKey или (xq, yq)); возвращает список bool.
+    Сообщения хэшируются одним вызовом, подписи одного ключа проверяются подряд
+    и используют общие кратные ключа
+    """
+    items = list(items)
+    alphas = hash_batch([msg for msg, _, _ in items])
+    results = [False] * len(items)
+    parsed = []
+    for index, ((_, signature, key), alpha) in enumerate(zip(items, alphas)):
+        rs = _parse_signature(signature)
+        if rs is not None:
+            parsed.append((tuple(key), index, rs, _message_scalar(alpha)))
+    # e^-1 mod q для всех подписей - одно обращение
+    inverses = batch_inverse((e for _, _, _, e in parsed), q)
+    pending = [(key, index, (r, s * v % q, -r * v % q)) for (key, index, (r, s), _), v in zip(parsed, inverses)]
+    pending.sort(key=lambda item: item[0])
+
+    if not fast:
+        for key, index, (r, z1, z2) in pending:
+            results[index] = _check_single(r, z1, z2, *key)
+        return results
+
+    for start in range(0, len(pending), BATCH_CHUNK):
+        chunk = pending[start:start + BATCH_CHUNK]
+        if _check_combination([(r, z1, z2, key) for key, _, (r, z1, z2) in chunk]):
+            for _, index, _ in chunk:
+                results[index] = True
+            continue
+        for key, index, (r, z1, z2) in chunk:
+            results[index] = _check_single(r, z1, z2, *key)
+    return results
+
+
+# ------ Параллельная подпись
+_worker_key = None
+
+
+def _init_sign_worker(d: int, table):
+    global _worker_key, _generator_table
+    # при fork таблица уже есть в памяти процесса (копия при записи), иначе передаётся сюда
+    if table is not None:
+        _generator_table = table
+    _worker_key = PrivateKey(d)
+
+
+def _sign_worker_batch(messages):
+    return _worker_key.sign_batch(messages)
+
+
+class SigningPool:
+    """
+    Пул процессов для подписи пакетов документов одним ключом. Таблица образующей
+    строится один раз в родительском процессе до запуска пула; одноразовые k берутся
+    из secrets (os.urandom), поэтому процессы после fork не повторяют их
+    """
+    def __init__(self, private_key: PrivateKey, workers: int = None, batch_size: int = 256):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        table = generator_table()
+        if "fork" in multiprocessing.get_all_start_methods():
+            context, table = multiprocessing.get_context("fork"), None
+        else:
+            context = None
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                         initializer=_init_sign_worker, initargs=(private_key.d, table))
+
+    def sign(self, messages):
+        """
+        Подписи сообщений в исходном порядке
+        """
+        messages = list(messages)
+        batches = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+        signatures = []
+        for batch in self._pool.map(_sign_worker_batch, batches):
+            signatures.extend(batch)
+        return signatures
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 p = 0x8000000000000000000000000000000000000000000000000000000000000431
@@ -63,57 +628,16 @@ q = 0x8000000000000000000000000000000150FE8A1892976154C59CFC193ACCF5B3
 xp = 0x2
 yp = 0x8E2A8A0E65147D4BD6316030E16D19C85C97F0A9CA267122B96ABBCEA7E8FC8
 d = 0x7A929ADE789BB9BE10ED359DD39A72C11B60961F49397EEE1D19CE9891EC3B28
-xq, yq = point_multiply(d, xp, yp)
 
 
 if __name__ == "__main__":
     msg = b"Hello, world!"
-    alpha = hash(msg, 256)
-    e = alpha % q
-    if e == 0:
-        e = 1
-    r = 0
-    s = 0
-    while r == 0 or s == 0:
-        k = secrets.randbelow(q - 1) + 1
-        xc, yc = point_multiply(k, xp, yp)
-        r = xc % q
-        s = (r*d + k*e) % q
-    
-    r_bytes = r.to_bytes(32)
-    s_bytes = s.to_bytes(32)
-    signature = r_bytes + s_bytes
+    private_key = PrivateKey(d)
+    signature = private_key.sign(msg)
 
     print("Подпись:", signature)
 
-    if len(signature) != 64:
-        raise Exception("Подпись неверна")
-    
-    extracted_r = int.from_bytes(signature[:32])
-    extracted_s = int.from_bytes(signature[32:])
-    
-    if extracted_r == 0 or extracted_s == 0:
-        raise Exception("Подпись неверна")
-    
-    if extracted_r > q or extracted_s > q:
-        raise Exception("Подпись неверна")
-
-    extracted_alpha = hash(msg, 256)
-    extracted_e = extracted_alpha % q
-    if extracted_e == 0:
-        extracted_e = 1
-    
-    extracted_v = mod_inverse(extracted_e, q)
-    extracted_z1 = (extracted_s * extracted_v) % q
-    extracted_z2 = ((-1) * extracted_r * extracted_v) % q
-
-    first_x, first_y = point_multiply(extracted_z1, xp, yp)
-    second_x, second_y = point_multiply(extracted_z2, xq, yq)
-    extracted_xc, extracted_yc = point_add(first_x, first_y, second_x, second_y)
-    extracted_R = extracted_xc % q
-    
-    if extracted_R != extracted_r:
-        print("Подпись неверна")
-    else:
+    if private_key.public_key.verify(msg, signature):
         print("Подпись верна")
-    
+    else:
+        print("Подпись неверна")
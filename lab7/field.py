@@ -0,0 +1,112 @@
+# Общая арифметика в поле вычетов для lab6 и lab7. Каждая лабораторная запускается
+# из своего каталога и не импортирует соседние, поэтому lab6/field.py и lab7/field.py -
+# одинаковые копии одного модуля: изменения вносятся в обе сразу (файлы должны совпадать)
+from typing import Tuple
+
+
+def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    """
+    (gcd, x, y), где a*x + b*y = gcd; итеративный алгоритм Евклида
+    """
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        quotient, remainder = divmod(a, b)
+        a, b = b, remainder
+        x0, x1 = x1, x0 - quotient * x1
+        y0, y1 = y1, y0 - quotient * y1
+    return a, x0, y0
+
+
+def mod_inverse(a: int, m: int) -> int:
+    g, x, _ = extended_gcd(a % m, m)
+    if g != 1:
+        raise Exception("Обратного элемента не существует")
+    return x % m
+
+
+def batch_inverse(values, m: int):
+    """
+    Обратные ко всем элементам списка (трюк Монтгомери): одно обращение
+    и около 3n умножений вместо n обращений
+    """
+    values = list(values)
+    if not values:
+        return []
+    prefix = [0] * len(values)
+    acc = 1
+    for i, value in enumerate(values):
+        prefix[i] = acc
+        acc = acc * value % m
+    acc_inv = mod_inverse(acc, m)
+    result = [0] * len(values)
+    for i in reversed(range(len(values))):
+        result[i] = acc_inv * prefix[i] % m
+        acc_inv = acc_inv * values[i] % m
+    return result
+
+
+def batch_to_affine(points, p: int):
+    """
+    Перевод многих якобиановых точек (X, Y, Z) в аффинные (x, y) с одним обращением;
+    бесконечно удалённая точка (Z = 0) переводится в (None, None)
+    """
+    points = list(points)
+    finite = [i for i, (_, _, Z) in enumerate(points) if Z % p]
+    inverses = batch_inverse((points[i][2] for i in finite), p)
+    result = [(None, None)] * len(points)
+    for i, z_inv in zip(finite, inverses):
+        X, Y, _ = points[i]
+        z_inv2 = z_inv * z_inv % p
+        result[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+    return result
+
+
+_sqrt_cache = {}
+
+
+def _sqrt_constants(modulus: int):
+    """
+    modulus - 1 = t * 2^s и z^t для квадратичного невычета z; считаются один раз на модуль
+    """
+    if modulus not in _sqrt_cache:
+        t, s = modulus - 1, 0
+        while t % 2 == 0:
+            t //= 2
+            s += 1
+        z = 2
+        while pow(z, (modulus - 1) // 2, modulus) != modulus - 1:
+            z += 1
+        _sqrt_cache[modulus] = t, s, pow(z, t, modulus)
+    return _sqrt_cache[modulus]
+
+
+def mod_sqrt(n: int, modulus: int):
+    """
+    Квадратный корень по простому модулю (Тонелли - Шенкс, одно возведение в степень);
+    None, если корня нет
+    """
+    n %= modulus
+    if n == 0:
+        return 0
+    t, s, c = _sqrt_constants(modulus)
+    x = pow(n, (t - 1) // 2, modulus)
+    u = x * x * n % modulus  # n^t
+    x = x * n % modulus      # n^((t+1)/2)
+    # критерий Эйлера: n^((modulus-1)/2) = u^(2^(s-1)) должно быть 1
+    check = u
+    for _ in range(s - 1):
+        check = check * check % modulus
+    if check != 1:
+        return None
+    while u != 1:
+        i, u2 = 0, u
+        while u2 != 1:
+            u2 = u2 * u2 % modulus
+            i += 1
+        for _ in range(s - i - 1):
+            c = c * c % modulus
+        x = x * c % modulus
+        c = c * c % modulus
+        u = u * c % modulus
+        s = i
+    return x
@@ -1,22 +1,5 @@
 import random
-
-
-def mod_inverse(a: int, m: int):
-    if a < 0:
-        a = (a % m + m) % m
-    g, x, _ = extended_gcd(a, m)
-    if g != 1:
-        raise Exception("Обратного элемента не существует")
-    return x % m
-
-
-def extended_gcd(a: int, b: int):
-    if a == 0:
-        return b, 0, 1
-    gcd, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return gcd, x, y
+from field import batch_to_affine, mod_inverse, mod_sqrt
 
 
 def point_add(x1: int, y1: int, x2: int, y2: int, a: int, p: int):
@@ -32,30 +15,104 @@ def point_add(x1: int, y1: int, x2: int, y2: int, a: int, p: int):
     return x3, y3
 
 
-def point_multiply(k: int, x: int, y: int, a: int, p: int):
-    result_x, result_y = None, None
-    buf_x, buf_y = x, y
-    
-    while k:
-        if k & 1: 
-            if result_x is None:
-                result_x, result_y = buf_x, buf_y
-            else:
-                result_x, result_y = point_add(result_x, result_y, buf_x, buf_y, a, p)
-        
-        buf_x, buf_y = point_add(buf_x, buf_y, buf_x, buf_y, a, p)
+# Якобиановы координаты: (X, Y, Z) соответствует (X/Z^2, Y/Z^3), Z = 0 - бесконечность
+INFINITY = (1, 1, 0)
+
+
+def to_affine(P, p: int):
+    return batch_to_affine([P], p)[0]
+
+
+def jacobian_double(P, a: int, p: int):
+    X, Y, Z = P
+    if Z == 0 or Y == 0:
+        return INFINITY
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    ZZ = Z * Z % p
+    M = (3 * X * X + a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y * Z % p
+    return X3, Y3, Z3
+
+
+def jacobian_add_affine(P, x2: int, y2: int, a: int, p: int):
+    X1, Y1, Z1 = P
+    if Z1 == 0:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % p
+    U2 = x2 * Z1Z1 % p
+    S2 = y2 * Z1 * Z1Z1 % p
+    if X1 == U2:
+        if Y1 != S2:
+            return INFINITY
+        return jacobian_double(P, a, p)
+    H = (U2 - X1) % p
+    R = (S2 - Y1) % p
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - Y1 * HHH) % p
+    Z3 = H * Z1 % p
+    return X3, Y3, Z3
+
+
+# wNAF: цифры скаляра нечётны и по модулю меньше 2^(w-1), между ненулевыми цифрами
+# не меньше w-1 нулей, поэтому сложений около n/(w+1). Отрицательная цифра - сложение
+# с -P = (x, -y), так что в таблице нужны только нечётные кратные P, 3P, ..., (2^(w-1)-1)P
+WNAF_WIDTH = 5
+
+
+def wnaf(k: int, width: int = WNAF_WIDTH):
+    """
+    Цифры width-NAF скаляра k > 0, начиная с младшей
+    """
+    digits = []
+    while k > 0:
+        if k & 1:
+            digit = k & ((1 << width) - 1)
+            if digit >= 1 << (width - 1):
+                digit -= 1 << width
+            k -= digit
+        else:
+            digit = 0
+        digits.append(digit)
         k >>= 1
-    
-    return result_x, result_y
-
-
-def sqrt_mod_p(a: int, p: int):
-    a = a % p
-    if a == 0:
-        return 0
-    if pow(a, (p - 1) // 2, p) != 1:
-        return None
-    return pow(a, (p + 1) // 4, p)
+    return digits
+
+
+def odd_multiples(x: int, y: int, a: int, p: int, width: int = WNAF_WIDTH):
+    """
+    [P, 3P, ..., (2^(w-1)-1)P] в аффинных координатах (два обращения на таблицу)
+    """
+    twice_x, twice_y = to_affine(jacobian_double((x, y, 1), a, p), p)
+    points = []
+    point = (x, y, 1)
+    for _ in range((1 << (width - 2)) - 1):
+        point = jacobian_add_affine(point, twice_x, twice_y, a, p)
+        points.append(point)
+    return [(x, y)] + batch_to_affine(points, p)
+
+
+def point_multiply(k: int, x: int, y: int, a: int, p: int, affine: bool = True, width: int = WNAF_WIDTH):
+    """
+    k * (x, y) по wNAF в якобиановых координатах; при affine=False результат не нормализуется,
+    чтобы многие точки можно было перевести в аффинные одним обращением
+    """
+    result = INFINITY
+    if k > 0:
+        table = odd_multiples(x, y, a, p, width=width)
+        for digit in reversed(wnaf(k, width)):
+            result = jacobian_double(result, a, p)
+            if digit > 0:
+                mx, my = table[digit >> 1]
+                result = jacobian_add_affine(result, mx, my, a, p)
+            elif digit < 0:
+                mx, my = table[-digit >> 1]
+                result = jacobian_add_affine(result, mx, -my % p, a, p)
+    return to_affine(result, p) if affine else result
 
 
 def encode_message(data: bytes, a: int, b: int, p: int, k_bits: int = 40):
@@ -64,7 +121,7 @@ def encode_message(data: bytes, a: int, b: int, p: int, k_bits: int = 40):
         x = (m << k_bits) | j
         x %= p
         y2 = (pow(x, 3, p) + a * x + b) % p
-        y = sqrt_mod_p(y2, p)
+        y = mod_sqrt(y2, p)
         if y is not None:
             return x, y
     raise Exception("Не удалось закодировать сообщение в точку на кривой")
@@ -78,39 +135,47 @@ def decode_message(x: int, y: int, k_bits: int = 40):
     return m.to_bytes(byte_len, 'big')
 
 
+def _encrypt_points(messages, pub_x: int, pub_y: int, gx: int, gy: int, a: int, p: int, n: int):
+    """
+    Шифрование многих точек: C1 = k*G, C2 = M + k*Q считаются в якобиановых координатах,
+    все результаты переводятся в аффинные одним обращением
+    """
+    points = []
+    for msg_x, msg_y in messages:
+        k = random.randint(1, n - 1)
+        points.append(point_multiply(k, gx, gy, a, p, affine=False))
+        shared = point_multiply(k, pub_x, pub_y, a, p, affine=False)
+        points.append(jacobian_add_affine(shared, msg_x, msg_y, a, p))
+    affine = batch_to_affine(points, p)
+    return list(zip(affine[0::2], affine[1::2]))
+
+
+def _decrypt_points(ciphertexts, d: int, a: int, p: int):
+    points = []
+    for c1, c2 in ciphertexts:
+        X, Y, Z = point_multiply(d, c1[0], c1[1], a, p, affine=False)
+        points.append(jacobian_add_affine((X, -Y % p, Z), c2[0], c2[1], a, p))
+    return batch_to_affine(points, p)
+
+
 def encrypt_point(msg_x: int, msg_y: int, pub_x: int, pub_y: int, gx: int, gy: int, a: int, p: int, n: int):
-    k = random.randint(1, n - 1)
-    c1_x, c1_y = point_multiply(k, gx, gy, a, p)
-    shared_x, shared_y = point_multiply(k, pub_x, pub_y, a, p)
-    c2_x, c2_y = point_add(msg_x, msg_y, shared_x, shared_y, a, p)
-    return (c1_x, c1_y), (c2_x, c2_y)
+    return _encrypt_points([(msg_x, msg_y)], pub_x, pub_y, gx, gy, a, p, n)[0]
 
 
 def decrypt_point(c1: tuple, c2: tuple, d: int, a: int, p: int):
-    shared_x, shared_y = point_multiply(d, c1[0], c1[1], a, p)
-    msg_x, msg_y = point_add(c2[0], c2[1], shared_x, (-shared_y) % p, a, p)
-    return msg_x, msg_y
+    return _decrypt_points([(c1, c2)], d, a, p)[0]
 
 
 def encrypt_data(data: bytes, pub_x: int, pub_y: int, gx: int, gy: int, a: int, b: int, p: int, n: int, k_bits: int = 40):
     max_chunk_size = (p.bit_length() - k_bits - 8) // 8
     chunks = [data[i:i + max_chunk_size] for i in range(0, len(data), max_chunk_size)]
-    
-    encrypted_chunks = []
-    for chunk in chunks:
-        if not chunk:
-            continue
-        msg_x, msg_y = encode_message(chunk, a, b, p, k_bits)
-        c1, c2 = encrypt_point(msg_x, msg_y, pub_x, pub_y, gx, gy, a, p, n)
-        encrypted_chunks.append((c1, c2))
-    
-    return encrypted_chunks
+    messages = [encode_message(chunk, a, b, p, k_bits) for chunk in chunks if chunk]
+    return _encrypt_points(messages, pub_x, pub_y, gx, gy, a, p, n)
 
 
 def decrypt_data(encrypted_chunks: list, d: int, a: int, p: int, k_bits: int = 40):
     decrypted_data = b''
-    for c1, c2 in encrypted_chunks:
-        msg_x, msg_y = decrypt_point(c1, c2, d, a, p)
+    for msg_x, msg_y in _decrypt_points(encrypted_chunks, d, a, p):
         chunk = decode_message(msg_x, msg_y, k_bits)
         decrypted_data += chunk
     return decrypted_data